@@ -0,0 +1,319 @@
+from datetime import datetime
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+# tests/ 의 모듈을 그대로 가져다 측정한다 (스크립트 실행 위치와 무관하게)
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests")
+sys.path.insert(0, TESTS_DIR)
+
+from gsheet_sink import BatchedSheetWriter, FakeGspreadClient  # noqa: E402
+from harness_log import configure as configure_logging  # noqa: E402
+from network_policy import FixtureSite  # noqa: E402
+from results import JsonlResultWriter, TestResult  # noqa: E402
+from timing_db import percentile  # noqa: E402
+
+# -----------------------------------------------------------------------------
+# 하네스 자체 벤치마크 (브라우저 기동 / 이동 / 요소 찾기 / 스크린샷 / 결과 기록 / 시트 저장)
+# -----------------------------------------------------------------------------
+# 사용 예:
+#   python benchmarks/run_benchmarks.py                          # 측정 + logs/benchmarks_<시각>.json 저장
+#   python benchmarks/run_benchmarks.py --save-baseline          # 이번 측정값을 기준값으로 저장
+#   python benchmarks/run_benchmarks.py --skip-browser           # Chrome 없는 환경 (결과 기록/시트만)
+# 기준값(benchmarks/baseline.json)이 있으면 중앙값을 비교해 허용 배수를 넘는 항목이 있을 때 종료 코드 1.
+# 종료 코드는 결과가 일정한 하네스 항목(GATED_GROUPS)만 따진다 - 브라우저 항목(기동/이동/요소 찾기/스크린샷)은
+# 러너마다 편차가 커서 비교 결과만 출력한다.
+# 기준값은 비교할 환경(CI 러너)에서 만들어야 의미가 있다 - CI는 저장소 대신 actions/cache에 기준값을 두고
+# 캐시가 비어 있을 때만 --save-baseline 으로 새로 만든다 (.github/workflows/main.yml 의 benchmarks 작업).
+#
+# 브라우저 항목은 실제 사이트 대신 로컬 픽스처 페이지를 쓴다 (네트워크 편차 제거).
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 1.5
+DEFAULT_MIN_DELTA_MS = 0.05
+GATED_GROUPS = ("harness",)
+
+LOOKUP_ITEMS = 300
+LOOKUPS_PER_SAMPLE = 20
+RESULT_ROWS = 500
+ASYNC_SESSIONS = 20
+
+# 이름 → (그룹, 측정 함수). 측정 함수는 ctx를 받아 측정 구간의 소요 초를 돌려준다.
+BENCHMARKS = {}
+
+
+def benchmark(name, group):
+    def register(func):
+        BENCHMARKS[name] = (group, func)
+        return func
+    return register
+
+
+class BenchSite(FixtureSite):
+    # 요소 찾기 비교용으로 목록이 긴 픽스처 페이지 (검색창은 다음 모바일과 같은 name/type)
+    PAGE = ("<!doctype html><html><head><meta charset=\"utf-8\"></head><body>"
+            "<form action=\"/search\"><input id=\"q\" name=\"q\" type=\"search\" class=\"tf_keyword\"></form>"
+            "<ul class=\"list_news\">"
+            + "".join(f"<li class=\"item_news\"><a href=\"/news/{i}\" class=\"link_news\">뉴스 {i}</a></li>"
+                      for i in range(LOOKUP_ITEMS))
+            + "</ul><p id=\"footer\">fixture</p></body></html>")
+
+
+class Context:
+    def __init__(self, profile):
+        self.profile = profile
+        self.workdir = tempfile.mkdtemp(prefix="harness_bench_")
+        self.site = None
+        self.driver = None
+
+    def browser(self):
+        # 기동 항목 외에는 세션 하나를 재사용
+        if self.driver is None:
+            from chrome_options import build_chrome_options
+            from driver_pool import start_chrome
+            self.site = self.site or BenchSite().start()
+            self.driver = start_chrome(build_chrome_options(profile=self.profile))
+            self.driver.get(self.site.url)
+        return self.driver
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+        if self.site is not None:
+            self.site.stop()
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+# --- 브라우저 ---
+@benchmark("driver.startup", "browser")
+def bench_startup(ctx):
+    from chrome_options import build_chrome_options
+    from driver_pool import start_chrome
+    profile_dir = tempfile.mkdtemp(prefix="chrome_bench_", dir=ctx.workdir)
+    started = time.perf_counter()
+    driver = start_chrome(build_chrome_options(profile_dir, profile=ctx.profile))
+    elapsed = time.perf_counter() - started
+    driver.quit()
+    return elapsed
+
+
+@benchmark("navigate.get", "browser")
+def bench_navigate(ctx):
+    driver = ctx.browser()
+    started = time.perf_counter()
+    driver.get(ctx.site.url)
+    return time.perf_counter() - started
+
+
+@benchmark("navigate.ready", "browser")
+def bench_navigate_ready(ctx):
+    # navigate_to_home과 같은 조건 (load + 네트워크 idle 확인)
+    from waits import wait_for_page_ready
+    driver = ctx.browser()
+    started = time.perf_counter()
+    driver.get(ctx.site.url)
+    wait_for_page_ready(driver, 10)
+    return time.perf_counter() - started
+
+
+def _lookup(ctx, by, value):
+    driver = ctx.browser()
+    started = time.perf_counter()
+    for _ in range(LOOKUPS_PER_SAMPLE):
+        driver.find_element(by, value)
+    return (time.perf_counter() - started) / LOOKUPS_PER_SAMPLE
+
+
+@benchmark("lookup.id", "browser")
+def bench_lookup_id(ctx):
+    from selenium.webdriver.common.by import By
+    return _lookup(ctx, By.ID, "q")
+
+
+@benchmark("lookup.css", "browser")
+def bench_lookup_css(ctx):
+    from selenium.webdriver.common.by import By
+    return _lookup(ctx, By.CSS_SELECTOR, "input[name='q'][type='search']")
+
+
+@benchmark("lookup.xpath", "browser")
+def bench_lookup_xpath(ctx):
+    # 스크립트에서 쓰는 검색창 XPath와 같은 형태
+    from selenium.webdriver.common.by import By
+    return _lookup(ctx, By.XPATH, '//input[@name="q" or @type="search"]')
+
+
+@benchmark("lookup.xpath_list", "browser")
+def bench_lookup_xpath_list(ctx):
+    from selenium.webdriver.common.by import By
+    return _lookup(ctx, By.XPATH, f'//li[@class="item_news"][{LOOKUP_ITEMS}]/a')
+
+
+@benchmark("screenshot.png", "browser")
+def bench_screenshot(ctx):
+    driver = ctx.browser()
+    started = time.perf_counter()
+    driver.get_screenshot_as_png()
+    return time.perf_counter() - started
+
+
+# --- 결과 처리 (브라우저 없음) ---
+def _sample_results(count):
+    executed_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return [
+        TestResult(str(i), "검색", ("Daum", "검색", "-", "-", "-", "-", "-"), "-", f"케이스 {i}",
+                   "PASS" if i % 10 else "FAIL", executed_at, 0.8, 0.4,
+                   error=None if i % 10 else "Message: no such element",
+                   metrics={"net.requests": 42})
+        for i in range(count)
+    ]
+
+
+@benchmark("results.jsonl", "harness")
+def bench_result_logging(ctx):
+    # 결과 레코드 생성 + JSONL 한 줄씩 기록 (log_test_result의 기록 경로, 건당 시간)
+    path = os.path.join(ctx.workdir, "results.jsonl")
+    started = time.perf_counter()
+    writer = JsonlResultWriter(path)
+    for record in _sample_results(RESULT_ROWS):
+        writer.write(record)
+    writer.close()
+    elapsed = time.perf_counter() - started
+    os.remove(path)
+    return elapsed / RESULT_ROWS
+
+
+@benchmark("sheets.flush", "harness")
+def bench_sheets_flush(ctx):
+    # 결과 500건을 가짜 gspread 클라이언트로 저장 (네트워크 제외한 하네스 쪽 비용)
+    records = _sample_results(RESULT_ROWS)
+    spreadsheet = FakeGspreadClient().open("bench")
+    started = time.perf_counter()
+    writer = BatchedSheetWriter(spreadsheet, "bench", ["번호", "카테고리", "기대결과", "실행결과", "실행시간", "비고"])
+    writer.add_rows([r.number, r.category, r.expected, r.result, r.executed_at, "자동화 테스트"] for r in records)
+    writer.flush()
+    return time.perf_counter() - started
+
+
+@benchmark("async.fake_sessions", "harness")
+def bench_async_sessions(ctx):
+    # asyncio 클라이언트로 가짜 WebDriver 서버에 세션 20개 동시 (지연 0 → 클라이언트/연결 풀 자체 비용)
+    import asyncio
+    from async_webdriver import run_fake_check
+    stats = asyncio.run(run_fake_check(ASYNC_SESSIONS, 0))
+    return stats["seconds"]
+
+
+# -----------------------------------------------------------------------------
+# 실행 / 저장 / 기준값 비교
+# -----------------------------------------------------------------------------
+def summarize(samples):
+    values = sorted(samples)
+    return {
+        "median": percentile(values, 0.5),
+        "p90": percentile(values, 0.9),
+        "min": values[0],
+        "samples": len(values),
+    }
+
+
+def run_benchmarks(names, repeat, warmup, profile):
+    ctx = Context(profile)
+    results = {}
+    try:
+        for name in names:
+            group, func = BENCHMARKS[name]
+            for _ in range(warmup):
+                func(ctx)
+            samples = [func(ctx) for _ in range(repeat)]
+            results[name] = dict(summarize(samples), group=group)
+            print(f"⏱️ {name:<20} 중앙값 {results[name]['median'] * 1000:>9.3f}ms  p90 {results[name]['p90'] * 1000:>9.3f}ms")
+    finally:
+        ctx.close()
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance, min_delta_ms):
+    # 중앙값이 기준값 × 허용 배수를 넘고, 차이도 min_delta_ms 이상일 때만 느려진 것으로 본다
+    # (GATED_GROUPS 밖의 항목은 느려져도 ⚠️ 표시만 하고 실패로 세지 않는다)
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        delta_ms = (current["median"] - base["median"]) * 1000
+        ratio = current["median"] / base["median"] if base["median"] else float("inf")
+        marker = "✅"
+        if ratio > tolerance and delta_ms > min_delta_ms:
+            marker = "❌" if current["group"] in GATED_GROUPS else "⚠️"
+        if marker == "❌":
+            regressions.append(name)
+        print(f"{marker} {name:<20} {base['median'] * 1000:>9.3f}ms → {current['median'] * 1000:>9.3f}ms (x{ratio:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="테스트 하네스 자체 성능 벤치마크")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="일부 항목만 실행")
+    parser.add_argument("--skip-browser", action="store_true", help="Chrome이 필요한 항목 제외")
+    parser.add_argument("--repeat", type=int, default=5, help="항목별 측정 횟수")
+    parser.add_argument("--warmup", type=int, default=1, help="측정 전 버리는 실행 횟수")
+    parser.add_argument("--profile", default="default", help="Chrome 실행 프로필 (chrome_options.LAUNCH_PROFILES)")
+    parser.add_argument("--out", default=None, help="결과 JSON 경로 (기본: logs/benchmarks_<시각>.json)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="비교할 기준값 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="허용 배수 (기준 중앙값 대비)")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS, help="이보다 작은 차이는 무시")
+    parser.add_argument("--log-level", default="WARNING", help="측정 중 하네스 로그 레벨 (기본 WARNING: 진행 로그 숨김)")
+    args = parser.parse_args()
+    # 측정 대상 모듈이 처음 로그를 남기기 전에 출력 스레드를 켜 둔다
+    configure_logging(level=args.log_level)
+
+    names = args.only or list(BENCHMARKS)
+    if args.skip_browser:
+        names = [name for name in names if BENCHMARKS[name][0] != "browser"]
+
+    results = run_benchmarks(names, args.repeat, args.warmup, args.profile)
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": args.profile,
+        "repeat": args.repeat,
+        "unit": "seconds",
+        "results": results,
+    }
+
+    out_path = args.out or os.path.join(os.getcwd(), "logs", f"benchmarks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"🧾 결과 저장: {out_path}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 기준값 저장: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ 기준값 파일이 없어 비교를 건너뜁니다: {args.baseline} (--save-baseline 으로 생성)")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n--- 기준값 비교 ({baseline.get('created_at', '-')}, 허용 x{args.tolerance}) ---")
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"❌ 느려진 항목 {len(regressions)}개: {', '.join(regressions)}")
+        return 1
+    print("✅ 기준값 대비 느려진 항목 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+from datetime import datetime
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from process_local import ProcessLocal
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# -----------------------------------------------------------------------------
+# 내용 주소 기반(content-addressed) 산출물 저장소 - 스크린샷/로그 중복 제거
+# -----------------------------------------------------------------------------
+# 같은 실패가 반복되면 바이트까지 같은 스크린샷이 실행마다 새 파일로 쌓인다.
+#  - blobs/<해시 앞 2자리>/<해시>.<확장자> : 내용 해시(sha256)가 같으면 한 번만 저장 (인코딩도 한 번만)
+#  - manifest.jsonl : 실행(run)/케이스/종류/원래 이름 → 해시 (한 줄 = 산출물 하나, 프로세스 워커도 append)
+#  - 이번 실행에서 새로 생긴 blob만 upload_dir 에 하드링크로 모아 둔다 → CI는 이 폴더만 업로드
+#  - 텍스트 로그는 zstd(zstandard 설치 시) 또는 gzip으로 압축, 스크린샷 변환(WebP 등)은 artifacts.py 저장기가 맡는다
+#  - gc(): 오래된 blob(나이 제한) → 최근 사용 순(LRU, 재사용 시 mtime 갱신)으로 용량 제한까지 삭제
+#
+# 프로세스 풀 워커는 환경 변수로 같은 저장소/실행 id를 이어받는다 (process_local.py).
+#   python tests/artifact_store.py logs/artifacts --gc --max-mb 500 --max-age-days 14
+
+STORE_PATH_ENV = "DAUM_ARTIFACT_STORE"
+STORE_RUN_ENV = "DAUM_ARTIFACT_RUN"
+STORE_UPLOAD_ENV = "DAUM_ARTIFACT_UPLOAD"
+
+DEFAULT_MAX_MB = 500
+DEFAULT_MAX_AGE_DAYS = 14
+CHUNK_BYTES = 1 << 20  # 로그 파일을 해시/압축할 때 한 번에 읽는 크기
+
+
+def text_codec():
+    return "zst" if ZSTD_AVAILABLE else "gz"
+
+
+def compress_stream(src, dst, codec, size=-1):
+    # 파일 → 파일 압축 (조각 단위라 로그 크기만큼 메모리를 쓰지 않음)
+    if codec == "zst":
+        zstandard.ZstdCompressor(level=10).copy_stream(src, dst, size=size, read_size=CHUNK_BYTES)
+    elif codec == "gz":
+        with gzip.GzipFile(filename="", mode="wb", compresslevel=6, fileobj=dst, mtime=0) as gz:
+            shutil.copyfileobj(src, gz, CHUNK_BYTES)
+    else:
+        shutil.copyfileobj(src, dst, CHUNK_BYTES)
+
+
+def file_digest(f):
+    # digest_of(파일 내용)과 같은 값
+    h = hashlib.sha256()
+    for chunk in iter(lambda: f.read(CHUNK_BYTES), b""):
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def digest_of(data, salt=""):
+    # salt: 같은 원본이라도 인코딩 설정(형식/크기/품질)이 다르면 다른 blob
+    h = hashlib.sha256(data)
+    if salt:
+        h.update(b"\0" + salt.encode())
+    return h.hexdigest()
+
+
+class ArtifactStore:
+    def __init__(self, root, run_id=None, upload_dir=None):
+        self.root = root
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.upload_dir = upload_dir
+        self.blob_dir = os.path.join(root, "blobs")
+        self.manifest_path = os.path.join(root, "manifest.jsonl")
+        self.stats = {"new": 0, "reused": 0, "bytes_written": 0, "bytes_saved": 0}
+        self._lock = threading.Lock()
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def blob_path(self, digest, ext):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.{ext}")
+
+    def put(self, data, ext, kind="log", case=None, name=None, digest=None, encode=None):
+        # data: 원본 바이트 / encode: 새 blob일 때만 호출하는 변환 함수 (원본 → 저장 바이트)
+        digest = digest or digest_of(data)
+        return self._put(digest, ext, lambda f: f.write(encode(data) if encode else data), len(data), kind, case, name)
+
+    def put_text_file(self, path, kind="log", case=None):
+        # 텍스트 로그(JSONL/트레이스 등)를 압축해서 저장 - 해시와 압축 모두 파일을 조각 단위로 읽는다
+        codec = text_codec()
+        ext = f"{os.path.basename(path).rsplit('.', 1)[-1]}.{codec}"
+        size = os.path.getsize(path)
+        with open(path, "rb") as src:
+            digest = file_digest(src)
+
+            def write(f):
+                src.seek(0)
+                compress_stream(src, f, codec, size)
+
+            return self._put(digest, ext, write, size, kind, case, os.path.basename(path))
+
+    def _put(self, digest, ext, write, size, kind, case, name):
+        # write(f): 새 blob일 때만 호출 - 저장할 내용을 f에 쓴다 / size: 원본 크기 (매니페스트용)
+        path = self.blob_path(digest, ext)
+        with self._lock:
+            new = not os.path.exists(path)
+            if new:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    write(f)
+                stored = os.path.getsize(tmp)
+                os.replace(tmp, path)  # 다른 프로세스가 같은 blob을 동시에 써도 안전
+                self.stats["new"] += 1
+                self.stats["bytes_written"] += stored
+                self._stage_upload(path)
+            else:
+                os.utime(path)  # LRU: 다시 쓰인 blob은 최근 사용으로
+                self.stats["reused"] += 1
+                self.stats["bytes_saved"] += os.path.getsize(path)
+            self._append_manifest({
+                "run": self.run_id, "case": case, "kind": kind, "name": name,
+                "hash": digest, "blob": os.path.relpath(path, self.root),
+                "bytes": size, "new": new, "at": datetime.now().isoformat(timespec="seconds"),
+            })
+        return path
+
+    def _stage_upload(self, path):
+        if not self.upload_dir:
+            return
+        target = os.path.join(self.upload_dir, "blobs", os.path.relpath(path, self.blob_dir))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+
+    def _append_manifest(self, entry):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        # 한 줄을 한 번에 append (프로세스 워커끼리 줄이 섞이지 않게)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(line)
+        if self.upload_dir:
+            os.makedirs(self.upload_dir, exist_ok=True)
+            with open(os.path.join(self.upload_dir, "manifest.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def entries(self, run_id=None):
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return [r for r in rows if run_id is None or r["run"] == run_id]
+
+    def gc(self, max_bytes=None, max_age_days=None):
+        # 1) 나이 제한을 넘긴 blob 2) 용량 제한을 넘는 만큼 오래 안 쓴 순서로 삭제 (이번 실행이 쓴 blob은 유지)
+        with self._lock:
+            keep = {r["blob"] for r in self.entries(self.run_id)}
+            blobs = []
+            for folder, _, files in os.walk(self.blob_dir):
+                for name in files:
+                    path = os.path.join(folder, name)
+                    stat = os.stat(path)
+                    blobs.append((stat.st_mtime, stat.st_size, path))
+            blobs.sort()
+            total = sum(size for _, size, _ in blobs)
+            cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+            removed, freed = 0, 0
+            for mtime, size, path in blobs:
+                if os.path.relpath(path, self.root) in keep:
+                    continue
+                too_old = cutoff is not None and mtime < cutoff
+                too_big = max_bytes is not None and total > max_bytes
+                if not (too_old or too_big):
+                    continue
+                os.remove(path)
+                total -= size
+                removed += 1
+                freed += size
+            if removed:
+                self._prune_manifest()
+            return {"removed": removed, "freed_bytes": freed, "kept": len(blobs) - removed, "bytes": total}
+
+    def _prune_manifest(self):
+        # 지워진 blob을 가리키는 줄은 manifest에서도 뺀다
+        rows = [r for r in self.entries() if os.path.exists(os.path.join(self.root, r["blob"]))]
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.manifest_path)
+
+    def size(self):
+        return sum(os.path.getsize(os.path.join(folder, name))
+                   for folder, _, files in os.walk(self.blob_dir) for name in files)
+
+
+_store = ProcessLocal({"root": STORE_PATH_ENV, "run_id": STORE_RUN_ENV, "upload_dir": STORE_UPLOAD_ENV})
+
+
+def configure(root, run_id=None, upload_dir=None):
+    if upload_dir:
+        shutil.rmtree(upload_dir, ignore_errors=True)  # 업로드 폴더는 실행마다 새로
+    store = ArtifactStore(os.path.abspath(root), run_id, os.path.abspath(upload_dir) if upload_dir else None)
+    _store.configure(store, root=store.root, run_id=store.run_id, upload_dir=store.upload_dir)
+    return store
+
+
+def get_store():
+    return _store.get(lambda env: ArtifactStore(**env) if env["root"] else None)
+
+
+def close_store():
+    return _store.detach()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="산출물 저장소 정리 / 조회")
+    parser.add_argument("root", help="저장소 경로 (예: logs/artifacts)")
+    parser.add_argument("--gc", action="store_true", help="나이/용량 제한으로 오래된 blob 삭제")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB, help="저장소 최대 크기 (MB)")
+    parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS, help="blob 최대 보관 일수")
+    parser.add_argument("--run", default=None, help="이 실행(run id)의 산출물 목록 출력")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root, run_id="gc")
+    if args.gc:
+        stats = store.gc(max_bytes=int(args.max_mb * 1024 * 1024), max_age_days=args.max_age_days)
+        print(f"🧹 blob {stats['removed']}개 삭제 ({stats['freed_bytes'] / 1024 / 1024:.1f}MB), "
+              f"남은 blob {stats['kept']}개 / {stats['bytes'] / 1024 / 1024:.1f}MB")
+    if args.run:
+        for r in store.entries(args.run):
+            print(f"{r['case'] or '-':>6} {r['kind']:>10} {r['blob']}  ({r['name']})")
+    if not args.gc and not args.run:
+        entries = store.entries()
+        runs = len({r["run"] for r in entries})
+        print(f"📦 {store.root}: 실행 {runs}회 / 산출물 {len(entries)}개 / blob 용량 {store.size() / 1024 / 1024:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from io import BytesIO
+import os
+import queue
+import threading
+
+from artifact_store import digest_of
+from harness_log import get_logger
+from process_local import ProcessLocal
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# -----------------------------------------------------------------------------
+# 실패 스크린샷 비동기 저장기
+# -----------------------------------------------------------------------------
+# 테스트 스레드는 get_screenshot_as_png()로 받은 PNG 바이트를 큐에 넣고 바로 복귀한다.
+# 축소/재압축(WebP, JPEG)과 디스크 쓰기는 백그라운드 스레드가 처리한다.
+# 큐 크기를 제한해 메모리에 쌓이는 스크린샷 수를 묶어둔다 (가득 차면 테스트 스레드가 대기).
+# store(artifact_store.ArtifactStore)를 넘기면 시각 붙은 파일 대신 내용 해시 blob으로 저장한다.
+#  - 경로는 원본 PNG 해시로 바로 정해지므로 submit 즉시 돌려줄 수 있고,
+#    이미 있는 blob이면 축소/재압축 없이 manifest 기록만 한다.
+
+DEFAULT_QUEUE_SIZE = 8
+EXTENSIONS = {"png": "png", "webp": "webp", "jpeg": "jpg"}
+
+_STOP = object()
+
+log = get_logger("artifacts")
+
+
+class AsyncArtifactWriter:
+    def __init__(self, directory, image_format="png", max_width=None, quality=80, queue_size=DEFAULT_QUEUE_SIZE, store=None):
+        if image_format not in EXTENSIONS:
+            raise ValueError(f"지원하지 않는 스크린샷 형식: {image_format}")
+        if image_format != "png" and not PIL_AVAILABLE:
+            log.warning(f"⚠️ Pillow가 없어 {image_format} 변환 없이 PNG로 저장합니다.")
+            image_format = "png"
+        self.directory = directory
+        self.image_format = image_format
+        self.max_width = max_width
+        self.quality = quality
+        self.store = store
+        self.written = []
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._worker, name="artifact-writer", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+    def submit_screenshot(self, png_bytes, base_filename, case=None, kind="screenshot"):
+        ext = EXTENSIONS[self.image_format]
+        if self.store is not None:
+            digest = digest_of(png_bytes, f"{self.image_format}:{self.max_width}:{self.quality}")
+            path = self.store.blob_path(digest, ext)
+            self._queue.put((png_bytes, path, (digest, ext, base_filename, case, kind)))
+            return path
+        path = os.path.join(self.directory, f"{base_filename}.{ext}")
+        self._queue.put((png_bytes, path, None))
+        return path
+
+    def _encode(self, png_bytes):
+        needs_resize = self.max_width is not None
+        if self.image_format == "png" and not needs_resize:
+            return png_bytes
+        image = Image.open(BytesIO(png_bytes))
+        if needs_resize and image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.LANCZOS)
+        out = BytesIO()
+        if self.image_format == "jpeg":
+            image.convert("RGB").save(out, "JPEG", quality=self.quality, optimize=True)
+        elif self.image_format == "webp":
+            image.save(out, "WEBP", quality=self.quality, method=4)
+        else:
+            image.save(out, "PNG", optimize=True)
+        return out.getvalue()
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                png_bytes, path, blob = item
+                if blob is not None:
+                    digest, ext, name, case, kind = blob
+                    self.store.put(png_bytes, ext, kind=kind, case=case, name=name, digest=digest, encode=self._encode)
+                else:
+                    with open(path, "wb") as f:
+                        f.write(self._encode(png_bytes))
+                self.written.append(path)
+            except Exception as e:
+                log.warning(f"⚠️ 스크린샷 저장 실패: {e}")
+            finally:
+                self._queue.task_done()
+
+    def drain(self):
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+
+_shared_writer = ProcessLocal()
+
+
+def shared_writer(directory, **kwargs):
+    # 프로세스마다 하나의 저장기를 만들어 공유 (프로세스 풀 워커 종료 시에도 큐를 비우고 끝낸다)
+    return _shared_writer.get(lambda _: AsyncArtifactWriter(directory, **kwargs), AsyncArtifactWriter.close)
+
+
+def close_shared_writer():
+    writer = _shared_writer.detach()
+    if writer is not None:
+        writer.close()
+    return writer
@@ -0,0 +1,164 @@
+from selenium.common.exceptions import WebDriverException
+
+import json
+import time
+
+from waits import waiting
+
+# -----------------------------------------------------------------------------
+# 페이지 안에서 한 번에 확인하는 조건 묶음 (execute_script 1회)
+# -----------------------------------------------------------------------------
+# "body 있음", "검색창 보임", "URL에 search 포함" 같은 조건을 하나씩 WebDriver로 물어보면
+# 조건 수 × 폴링 횟수만큼 HTTP 왕복이 생긴다. 조건 묶음을 JavaScript 하나로 만들어
+#  - check(driver) : execute_script 1회로 지금 상태를 확인
+#  - wait(driver)  : execute_async_script 1회로 페이지 안에서 폴링하다가 모두 만족하거나 기한이 지나면 반환
+#  - wait_async(session) : 같은 동작을 async_webdriver 세션에서 await 로
+# 결과는 조건별 (이름, 성공 여부, 상세) 목록으로 돌려준다.
+#
+# 조건 JS는 페이지에서 eval 없이 돌도록 스크립트 소스에 그대로 펼쳐 넣는다 (CSP unsafe-eval 제한 회피).
+# 기다리는 중에 페이지가 바뀌면(검색 제출 등) 비동기 스크립트가 끊기므로 남은 시간으로 새 페이지에서 다시 시도한다.
+
+POLL_INTERVAL_MS = 50
+SCRIPT_TIMEOUT = 30  # WebDriver 기본 스크립트 타임아웃 (초)
+
+
+class Predicate:
+    # body: [성공 여부, 상세 문자열]을 return 하는 JS 함수 본문
+    def __init__(self, name, body):
+        self.name = name
+        self.body = body
+
+
+def _js(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def body_present():
+    return Predicate("body_present", "return [!!document.body, document.readyState];")
+
+
+def element_present(css, name=None):
+    return Predicate(name or f"present {css}", f"""
+        const count = document.querySelectorAll({_js(css)}).length;
+        return [count > 0, count + ' found'];""")
+
+
+def element_visible(css, name=None):
+    return Predicate(name or f"visible {css}", f"""
+        const el = document.querySelector({_js(css)});
+        if (!el) return [false, 'not found'];
+        const style = getComputedStyle(el);
+        const shown = el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+        return [shown, shown ? 'visible' : 'hidden'];""")
+
+
+def element_count_at_least(css, minimum, name=None):
+    return Predicate(name or f"count {css} >= {minimum}", f"""
+        const count = document.querySelectorAll({_js(css)}).length;
+        return [count >= {int(minimum)}, count + ' found'];""")
+
+
+def text_contains(css, text, name=None):
+    return Predicate(name or f"text {css} ~ {text}", f"""
+        const el = document.querySelector({_js(css)});
+        if (!el) return [false, 'not found'];
+        const value = (el.innerText || el.value || '').trim();
+        return [value.includes({_js(text)}), value.slice(0, 80)];""")
+
+
+def url_contains(text, name=None):
+    return Predicate(name or f"url ~ {text}", f"return [location.href.includes({_js(text)}), location.href];")
+
+
+def title_contains(text, name=None):
+    return Predicate(name or f"title ~ {text}", f"return [document.title.includes({_js(text)}), document.title];")
+
+
+def script(name, body):
+    return Predicate(name, body)
+
+
+class PredicateResult:
+    __slots__ = ("name", "ok", "detail")
+
+    def __init__(self, name, ok, detail):
+        self.name = name
+        self.ok = ok
+        self.detail = detail
+
+    def __repr__(self):
+        return f"{'✅' if self.ok else '❌'} {self.name} ({self.detail})"
+
+
+class AssertionBatchError(AssertionError):
+    def __init__(self, batch_name, results):
+        self.results = results
+        failed = ", ".join(repr(r) for r in results if not r.ok)
+        super().__init__(f"[{batch_name}] 조건 불만족: {failed}")
+
+
+class AssertionBatch:
+    def __init__(self, name, *predicates):
+        self.name = name
+        self.predicates = predicates
+        checks = ",\n".join(f"() => {{ {p.body} }}" for p in predicates)
+        evaluate = f"""
+const CHECKS = [{checks}];
+function evaluate() {{
+    return CHECKS.map(check => {{
+        try {{ const r = check(); return [!!r[0], String(r[1])]; }}
+        catch (e) {{ return [false, 'error: ' + e.message]; }}
+    }});
+}}"""
+        # 컴파일된 소스는 묶음마다 한 번만 만든다
+        self._check_source = evaluate + "\nreturn evaluate();"
+        self._wait_source = evaluate + """
+const deadline = Date.now() + arguments[0];
+const interval = arguments[1];
+const done = arguments[arguments.length - 1];
+(function poll() {
+    const results = evaluate();
+    if (results.every(r => r[0]) || Date.now() >= deadline) { done(results); return; }
+    setTimeout(poll, interval);
+})();"""
+
+    def _results(self, raw):
+        return [PredicateResult(p.name, ok, detail) for p, (ok, detail) in zip(self.predicates, raw)]
+
+    def check(self, driver):
+        return self._results(driver.execute_script(self._check_source))
+
+    def wait(self, driver, timeout, raise_on_failure=True):
+        if timeout + 1 > SCRIPT_TIMEOUT:
+            driver.set_script_timeout(timeout + 5)
+        deadline = time.perf_counter() + timeout
+        with waiting(self.name):
+            while True:
+                remaining_ms = max(0, int((deadline - time.perf_counter()) * 1000))
+                try:
+                    results = self._results(driver.execute_async_script(self._wait_source, remaining_ms, POLL_INTERVAL_MS))
+                    break
+                except WebDriverException as e:
+                    # 폴링 중 페이지 이동 → 새 문서에서 남은 시간만큼 다시
+                    if "unload" not in str(e) or time.perf_counter() >= deadline:
+                        raise
+        if raise_on_failure and not all(r.ok for r in results):
+            raise AssertionBatchError(self.name, results)
+        return results
+
+    async def wait_async(self, session, timeout, raise_on_failure=True):
+        # async_webdriver.AsyncSession 용 (같은 스크립트, 같은 재시도 규칙)
+        if timeout + 1 > SCRIPT_TIMEOUT:
+            await session.set_script_timeout(timeout + 5)
+        deadline = time.perf_counter() + timeout
+        while True:
+            remaining_ms = max(0, int((deadline - time.perf_counter()) * 1000))
+            try:
+                results = self._results(await session.execute_async_script(self._wait_source, remaining_ms, POLL_INTERVAL_MS))
+                break
+            except WebDriverException as e:
+                if "unload" not in str(e) or time.perf_counter() >= deadline:
+                    raise
+        if raise_on_failure and not all(r.ok for r in results):
+            raise AssertionBatchError(self.name, results)
+        return results
@@ -0,0 +1,720 @@
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from contextlib import asynccontextmanager
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import os
+import shutil
+import socket
+import time
+from urllib.parse import quote, urlsplit
+
+from case_engine import RETRY_POLICIES, block_case, blocked_reason, dependency_waves
+from harness_log import get_logger, log_context
+from tracing import command_attributes, get_tracer, span
+from waits import NETWORK_IDLE_MS, case_budget, waiting
+import locators
+
+# -----------------------------------------------------------------------------
+# asyncio WebDriver 클라이언트 (W3C WebDriver 프로토콜 직접 호출) + 비동기 실행 엔진
+# -----------------------------------------------------------------------------
+# Selenium 클라이언트는 명령마다 스레드를 막고 기다리므로, 세션 수십 개를 돌리려면 스레드도 수십 개가 필요하다.
+# 여기서는 이벤트 루프 하나에서
+#  - ConnectionPool : chromedriver 하나에 keep-alive HTTP/1.1 연결을 풀로 유지 (연결마다 요청 1개씩)
+#  - AsyncSession   : 이동/찾기/클릭/입력/스크립트/스크린샷/CDP 명령을 await 로 (실패는 Selenium 예외로 변환 - 재시도 정책 그대로 사용)
+#  - wait_until / present / visible / clickable : ProfiledWait + locators 조건의 비동기 버전
+#  - run_cases_async: 세션 수(concurrency)만큼 케이스를 동시에 실행 (의존 관계/재시도/서킷 브레이커는 case_engine 규칙 그대로)
+# 외부 라이브러리 없이 표준 라이브러리(asyncio 스트림)만 사용한다.
+#
+# FakeWebDriverServer 는 같은 프로토콜의 일부를 흉내 내는 로컬 서버 (Chrome 없이 클라이언트/엔진 확인용):
+#   python tests/async_webdriver.py --sessions 50 --latency-ms 20
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+POLL_INTERVAL = 0.1
+REQUEST_TIMEOUT = 60
+DEFAULT_POOL_SIZE = 32
+# 응답을 못 받았을 때 다시 보내도 되는 요청 (POST 명령은 서버가 이미 처리했을 수 있다 - 클릭/입력이 두 번 되지 않도록)
+IDEMPOTENT_METHODS = ("GET", "HEAD", "DELETE")
+
+# W3C 오류 코드 → Selenium 예외 (case_engine 재시도/환경 오류 판단을 그대로 쓰기 위해)
+W3C_ERRORS = {
+    "no such element": NoSuchElementException,
+    "stale element reference": StaleElementReferenceException,
+    "timeout": TimeoutException,
+    "script timeout": TimeoutException,
+}
+
+# W3C 는 ID 전략이 없으므로 CSS 로 바꿔 보낸다
+W3C_STRATEGIES = {By.CSS_SELECTOR: "css selector", By.XPATH: "xpath"}
+
+log = get_logger("async_webdriver")
+
+
+def _w3c_locator(by, value):
+    if by == By.ID:
+        return "css selector", f'[id="{value}"]'
+    return W3C_STRATEGIES.get(by, by), value
+
+
+# -----------------------------------------------------------------------------
+# keep-alive HTTP 연결 풀
+# -----------------------------------------------------------------------------
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.uses = 0
+
+    def close(self):
+        self.writer.close()
+
+
+class ConnectionPool:
+    def __init__(self, host, port, size=DEFAULT_POOL_SIZE, timeout=REQUEST_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.stats = {"requests": 0, "opened": 0, "reused": 0}
+        self._idle = []  # 최근에 쓴 연결부터 재사용
+        self._slots = asyncio.Semaphore(size)
+
+    async def _open(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.stats["opened"] += 1
+        return _Connection(reader, writer)
+
+    def _take_idle(self):
+        # 서버가 이미 닫은 유휴 연결(EOF 수신)은 요청을 보내기 전에 버린다
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.reader.at_eof():
+                return conn
+            conn.close()
+        return None
+
+    async def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        async with self._slots:
+            self.stats["requests"] += 1
+            conn = self._take_idle()
+            if conn is not None:
+                self.stats["reused"] += 1
+            try:
+                try:
+                    status, data, keep_alive = await asyncio.wait_for(
+                        self._roundtrip(conn or await self._open(), method, path, body), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if conn is None or method not in IDEMPOTENT_METHODS:
+                        raise
+                    # 보낸 뒤에 끊긴 재사용 연결 → 조회/삭제 요청만 새 연결로 한 번 다시
+                    conn.close()
+                    conn = None
+                    status, data, keep_alive = await asyncio.wait_for(
+                        self._roundtrip(await self._open(), method, path, body), self.timeout)
+            except asyncio.TimeoutError:
+                raise TimeoutException(f"WebDriver 응답 없음 ({method} {path}, {self.timeout}s)") from None
+            return status, data, keep_alive
+
+    async def _roundtrip(self, conn, method, path, body):
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\nContent-Length: {len(body)}\r\n"
+                f"Connection: keep-alive\r\n\r\n")
+        try:
+            conn.writer.write(head.encode() + body)
+            await conn.writer.drain()
+            status, headers, data = await _read_response(conn.reader)
+        except BaseException:
+            conn.close()
+            raise
+        conn.uses += 1
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if keep_alive:
+            self._idle.append(conn)
+        else:
+            conn.close()
+        return status, data, keep_alive
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+async def _read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+        if line in (b"\r\n", b"\n"):
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    return await reader.readexactly(int(headers.get("content-length", 0)))
+
+
+async def _read_response(reader):
+    status_line = await reader.readline()
+    if not status_line:
+        raise asyncio.IncompleteReadError(b"", None)
+    status = int(status_line.split()[1])
+    headers = await _read_headers(reader)
+    return status, headers, await _read_body(reader, headers)
+
+
+# -----------------------------------------------------------------------------
+# 세션 / 요소
+# -----------------------------------------------------------------------------
+class AsyncElement:
+    __slots__ = ("session", "id")
+
+    def __init__(self, session, element_id):
+        self.session = session
+        self.id = element_id
+
+    async def click(self):
+        await self.session.command("POST", f"/element/{self.id}/click", {})
+
+    async def clear(self):
+        await self.session.command("POST", f"/element/{self.id}/clear", {})
+
+    async def send_keys(self, text):
+        await self.session.command("POST", f"/element/{self.id}/value", {"text": text})
+
+    async def is_displayed(self):
+        return await self.session.command("GET", f"/element/{self.id}/displayed")
+
+    async def is_enabled(self):
+        return await self.session.command("GET", f"/element/{self.id}/enabled")
+
+    async def text(self):
+        return await self.session.command("GET", f"/element/{self.id}/text")
+
+
+class AsyncSession:
+    def __init__(self, pool, session_id, capabilities=None):
+        self.pool = pool
+        self.session_id = session_id
+        self.capabilities = capabilities or {}
+        self.commands = 0
+
+    async def command(self, method, path, payload=None):
+        self.commands += 1
+        if get_tracer() is None:
+            return await _call(self.pool, method, f"/session/{self.session_id}{path}", payload)
+        # 스팬 이름은 요소 id를 뺀 경로 (POST /element/{id}/click → webdriver.POST /element/click)
+        segments = path.strip("/").split("/")
+        attributes = command_attributes(path, payload)
+        if len(segments) > 2 and segments[0] == "element":
+            attributes["element.id"] = segments.pop(1)
+        with span(f"webdriver.{method} /{'/'.join(segments)}", attributes):
+            return await _call(self.pool, method, f"/session/{self.session_id}{path}", payload)
+
+    async def get(self, url):
+        await self.command("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        return await self.command("GET", "/url")
+
+    async def title(self):
+        return await self.command("GET", "/title")
+
+    async def find_element(self, by, value):
+        using, value = _w3c_locator(by, value)
+        found = await self.command("POST", "/element", {"using": using, "value": value})
+        return AsyncElement(self, found[ELEMENT_KEY])
+
+    async def find_elements(self, by, value):
+        using, value = _w3c_locator(by, value)
+        found = await self.command("POST", "/elements", {"using": using, "value": value})
+        return [AsyncElement(self, item[ELEMENT_KEY]) for item in found]
+
+    async def execute_script(self, script, *args):
+        return await self.command("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def execute_async_script(self, script, *args):
+        return await self.command("POST", "/execute/async", {"script": script, "args": list(args)})
+
+    async def set_script_timeout(self, seconds):
+        await self.command("POST", "/timeouts", {"script": int(seconds * 1000)})
+
+    async def execute_cdp_cmd(self, cmd, params):
+        # chromedriver 확장 명령 (Selenium Chrome 드라이버의 execute_cdp_cmd 와 같은 경로)
+        return await self.command("POST", "/goog/cdp/execute", {"cmd": cmd, "params": params})
+
+    async def screenshot_png(self):
+        return base64.b64decode(await self.command("GET", "/screenshot"))
+
+    async def quit(self):
+        await _call(self.pool, "DELETE", f"/session/{self.session_id}")
+
+
+async def _call(pool, method, path, payload=None):
+    status, data, _ = await pool.request(method, path, payload)
+    try:
+        value = json.loads(data)["value"] if data else None
+    except (ValueError, KeyError, TypeError):
+        raise WebDriverException(f"잘못된 WebDriver 응답 ({status}): {data[:200]!r}") from None
+    if status >= 400 or (isinstance(value, dict) and "error" in value and status != 200):
+        error = value.get("error", "unknown error") if isinstance(value, dict) else "unknown error"
+        message = value.get("message", "") if isinstance(value, dict) else str(value)
+        raise W3C_ERRORS.get(error, WebDriverException)(f"{error}: {message}")
+    return value
+
+
+async def new_session(pool, capabilities):
+    value = await _call(pool, "POST", "/session", {"capabilities": {"alwaysMatch": capabilities}})
+    return AsyncSession(pool, value["sessionId"], value.get("capabilities"))
+
+
+@asynccontextmanager
+async def open_session(pool, capabilities):
+    session = await new_session(pool, capabilities)
+    try:
+        yield session
+    finally:
+        try:
+            await session.quit()
+        except WebDriverException as e:
+            log.warning(f"⚠️ 세션 종료 중 오류: {e}")
+
+
+# -----------------------------------------------------------------------------
+# 대기 / 로케이터 조건 (waits.ProfiledWait, locators.present/visible/clickable 의 비동기 버전)
+# -----------------------------------------------------------------------------
+async def wait_until(session, condition, timeout, interval=POLL_INTERVAL, message=""):
+    # condition(session) -> awaitable. 참 값이 나오면 그 값을 반환, 시간 초과 시 TimeoutException
+    # 걸린 시간은 ProfiledWait.until 처럼 케이스의 대기 시간으로 집계 (태스크마다 따로)
+    name = getattr(condition, "__name__", "condition")
+    deadline = time.perf_counter() + timeout
+    with waiting(name):
+        while True:
+            try:
+                value = await condition(session)
+                if value:
+                    return value
+            except (NoSuchElementException, StaleElementReferenceException):
+                pass
+            if time.perf_counter() >= deadline:
+                raise TimeoutException(message or f"{name} ({timeout}s)")
+            await asyncio.sleep(interval)
+
+
+async def find(session, name):
+    # 레지스트리 로케이터를 빠른 전략부터 (처음 찾은 전략은 Locator 가 기억)
+    locator = locators.LOCATORS[name]
+    last_error = None
+    for strategy in locator.candidates():
+        try:
+            element = await session.find_element(*strategy)
+        except NoSuchElementException as e:
+            last_error = e
+            continue
+        locator.remember(strategy)
+        return element
+    raise last_error
+
+
+def present(name):
+    async def present_element(session):
+        return await find(session, name)
+    present_element.__name__ = f"present_element({name})"
+    return present_element
+
+
+def visible(name):
+    async def visible_element(session):
+        element = await find(session, name)
+        return element if await element.is_displayed() else False
+    visible_element.__name__ = f"visible_element({name})"
+    return visible_element
+
+
+def clickable(name):
+    async def clickable_element(session):
+        element = await find(session, name)
+        return element if await element.is_displayed() and await element.is_enabled() else False
+    clickable_element.__name__ = f"clickable_element({name})"
+    return clickable_element
+
+
+async def wait_for_page_ready(session, timeout, idle_ms=NETWORK_IDLE_MS):
+    # waits.wait_for_page_ready 와 같은 기준: readyState == complete 후 리소스 요청 수가 idle_ms 동안 그대로
+    async def document_complete(s):
+        return await s.execute_script("return document.readyState") == "complete"
+    await wait_until(session, document_complete, timeout)
+
+    state = {"count": -1, "since": time.perf_counter()}
+
+    async def network_idle(s):
+        count = await s.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.perf_counter()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return (now - state["since"]) * 1000 >= idle_ms
+
+    try:
+        await wait_until(session, network_idle, timeout)
+    except TimeoutException:
+        log.warning("⚠️ 네트워크 idle 대기 시간 초과 - readyState 기준으로 진행합니다.")
+
+
+async def wait_for_scroll_settle(session, timeout):
+    state = {"last": None}
+
+    async def settled(s):
+        position = await s.execute_script("return window.scrollY")
+        stable = position == state["last"]
+        state["last"] = position
+        return stable
+    await wait_until(session, settled, timeout)
+
+
+# -----------------------------------------------------------------------------
+# 비동기 실행 엔진
+# -----------------------------------------------------------------------------
+async def _run_attempts(session, case, budget, before_retry):
+    # case_engine._run_attempts 와 같은 순서 (실행 횟수는 budget.attempts 에)
+    policy = RETRY_POLICIES[case.retry_policy]
+    while True:
+        try:
+            with span("case.attempt", {"case.attempt": budget.attempts}):
+                await case.async_step(session)
+            return None
+        except Exception as e:
+            if not policy.should_retry(e, budget.attempts):
+                return e
+            log.warning(f"🔁 Case #{case.case_id} 재시도 ({budget.attempts}/{policy.attempts - 1}, {type(e).__name__})")
+        with waiting("retry backoff"):
+            await asyncio.sleep(policy.delay(budget.attempts))
+        budget.attempts += 1
+        if before_retry:
+            try:
+                await before_retry(session, case)
+            except Exception as e:
+                return e
+
+
+async def run_cases_async(cases, session_factory, log_result, concurrency, before_each=None, breaker=None, outcomes=None,
+                          collect=None):
+    # session_factory()                            : 케이스마다 새 세션을 여는 async context manager
+    # before_each(session, case)                   : 케이스 시작/재시도 전 준비 (홈 이동 등, await)
+    # collect(session, case)                       : 세션을 닫기 전에 결과에 붙일 측정값 dict (성능 지표 등, await)
+    # log_result(case, result, error, png, metrics): 결과 한 건 기록 (동기 - FAIL 스크린샷은 엔진이 받아서 넘김)
+    #                                                기록 시점에 waits.current_budget()으로 대기/동작 시간을 읽을 수 있다
+    # 같은 의존 단계(wave)의 케이스는 concurrency 개 세션으로 동시에, 다음 단계는 앞 단계가 끝난 뒤
+    outcomes = {} if outcomes is None else outcomes
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run_one(case):
+        async with slots:
+            with case_budget(case.case_id) as budget, log_context(case=case.case_id), \
+                    span("case", {"case.id": case.case_id, "case.category": case.category}) as current:
+                png_bytes = None
+                collected = {}
+                commands = 0
+                try:
+                    async with session_factory() as session:
+                        if before_each:
+                            with span("case.setup", {"case.id": case.case_id}):
+                                await before_each(session, case)
+                        error = await _run_attempts(session, case, budget, before_each)
+                        if error is not None:
+                            try:
+                                png_bytes = await session.screenshot_png()
+                            except WebDriverException:
+                                pass
+                        if collect:
+                            collected = await collect(session, case) or {}
+                        commands = session.commands
+                except Exception as e:
+                    # 세션 생성/준비 단계 실패도 케이스 실패로 (서킷 브레이커가 환경 오류로 판단)
+                    error = e
+                if breaker is not None:
+                    breaker.record(case.case_id, "FAIL" if error is not None else "PASS", error)
+                result = "FAIL" if error is not None else "PASS"
+                if error is not None and current is not None:
+                    current.record_failure(error, outcome="fail")
+                metrics = {"async.seconds": round(budget.elapsed(), 3), "async.commands": commands, **collected}
+                if budget.attempts > 1:
+                    metrics["retry.attempts"] = budget.attempts
+                    metrics["retry.flaky"] = result == "PASS"
+                log_result(case, result, error, png_bytes, metrics)
+                return result
+
+    for wave in dependency_waves(cases):
+        runnable = []
+        for case in wave:
+            reason = blocked_reason(case, outcomes, breaker)
+            if reason:
+                outcomes[case.case_id] = block_case(
+                    None, case, lambda _driver, c, result, error: log_result(c, result, error, None, None), reason)
+            else:
+                runnable.append(case)
+        results = await asyncio.gather(*(run_one(case) for case in runnable))
+        outcomes.update({case.case_id: result for case, result in zip(runnable, results)})
+    return [outcomes[c.case_id] for c in cases]
+
+
+# -----------------------------------------------------------------------------
+# chromedriver 프로세스 (세션 여러 개를 한 프로세스에서)
+# -----------------------------------------------------------------------------
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def find_chromedriver():
+    path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+    if path:
+        return path
+    try:
+        # Selenium Manager 가 받아 둔 드라이버 (selenium 4.11+)
+        from selenium.webdriver.common.selenium_manager import SeleniumManager
+        return SeleniumManager().binary_paths(["--browser", "chrome"])["driver_path"]
+    except Exception as e:
+        raise WebDriverException(f"chromedriver를 찾을 수 없습니다 (CHROMEDRIVER_PATH 지정 필요): {e}") from e
+
+
+class ChromeDriverService:
+    def __init__(self, executable=None, port=None):
+        self.executable = executable
+        self.port = port
+        self.process = None
+
+    async def start(self, timeout=20):
+        self.executable = self.executable or find_chromedriver()
+        self.port = self.port or _free_port()
+        self.process = await asyncio.create_subprocess_exec(
+            self.executable, f"--port={self.port}",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL)
+        pool = ConnectionPool("127.0.0.1", self.port, size=1, timeout=2)
+        deadline = time.perf_counter() + timeout
+        try:
+            while True:
+                try:
+                    if (await _call(pool, "GET", "/status")).get("ready"):
+                        return self
+                except (OSError, WebDriverException):
+                    pass
+                if time.perf_counter() >= deadline:
+                    raise WebDriverException(f"chromedriver 시작 시간 초과 ({timeout}s)")
+                await asyncio.sleep(0.1)
+        finally:
+            await pool.close()
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            await self.process.wait()
+
+
+# -----------------------------------------------------------------------------
+# 가짜 WebDriver 서버 (Chrome 없이 클라이언트/엔진 확인용)
+# -----------------------------------------------------------------------------
+# 페이지: 경로 → {"title", "elements": {선택자: {"submit": 엔터 입력 시 이동할 경로, "href": 클릭 시 이동할 경로}}}
+# 선택자는 locators.LOCATORS 의 CSS/XPath 문자열을 그대로 키로 쓴다 (문자열 일치로만 찾음).
+# 스크립트는 실행하지 않고 readyState / scrollY / location.href 조회 정도만 흉내 낸다.
+FAKE_PAGES = {
+    "/": {"title": "Daum", "elements": {
+        locators.css("body"): {},
+        locators.css("search_input"): {"submit": "/search?w=tot&q="},
+    }},
+    "/search": {"title": "검색 결과", "elements": {locators.css("body"): {}}},
+}
+FAKE_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGP4z8AAAAMBAQDJ/pLvAAAAAElFTkSuQmCC")
+
+
+class FakeWebDriverServer:
+    def __init__(self, pages=None, latency_ms=0, port=0):
+        self.pages = pages or FAKE_PAGES
+        self.latency = latency_ms / 1000
+        self.port = port
+        self.sessions = {}
+        self.stats = {"requests": 0, "connections": 0, "sessions": 0, "max_sessions": 0}
+        self._ids = itertools.count(1)
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        self.stats["connections"] += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = await _read_headers(reader)
+                body = await _read_body(reader, headers)
+                self.stats["requests"] += 1
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                status, value = self._handle(method, path, json.loads(body) if body else None)
+                data = json.dumps({"value": value}).encode()
+                writer.write(f"HTTP/1.1 {status} OK\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n\r\n".encode() + data)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # 클라이언트 연결 종료 / 서버 종료
+        finally:
+            writer.close()
+
+    def _error(self, status, error, message):
+        return status, {"error": error, "message": message}
+
+    def _handle(self, method, path, payload):
+        parts = [p for p in path.split("/") if p]
+        if parts == ["status"]:
+            return 200, {"ready": True, "message": "fake"}
+        if parts == ["session"] and method == "POST":
+            session_id = f"fake-{next(self._ids)}"
+            self.sessions[session_id] = {"url": "about:blank", "path": None, "elements": {}, "scroll": 0}
+            self.stats["sessions"] += 1
+            self.stats["max_sessions"] = max(self.stats["max_sessions"], len(self.sessions))
+            return 200, {"sessionId": session_id, "capabilities": (payload or {}).get("capabilities", {})}
+        if len(parts) < 2 or parts[0] != "session" or parts[1] not in self.sessions:
+            return self._error(404, "invalid session id", path)
+        session, rest = self.sessions[parts[1]], parts[2:]
+        if not rest and method == "DELETE":
+            del self.sessions[parts[1]]
+            return 200, None
+        command = "/".join(rest)
+        if command == "url":
+            if method == "POST":
+                self._navigate(session, payload["url"])
+                return 200, None
+            return 200, session["url"]
+        if command == "title":
+            page = self.pages.get(session["path"])
+            return 200, page["title"] if page else ""
+        if command in ("element", "elements"):
+            page = self.pages.get(session["path"]) or {"elements": {}}
+            if payload["value"] not in page["elements"]:
+                return (200, []) if command == "elements" else self._error(404, "no such element", payload["value"])
+            element_id = f"element-{next(self._ids)}"
+            session["elements"][element_id] = (session["path"], page["elements"][payload["value"]])
+            found = {ELEMENT_KEY: element_id}
+            return 200, [found] if command == "elements" else found
+        if command.startswith("element/"):
+            element_id, action = rest[1], "/".join(rest[2:])
+            path, element = session["elements"].get(element_id, (None, None))
+            if path != session["path"]:
+                return self._error(404, "stale element reference", element_id)
+            if action in ("displayed", "enabled"):
+                return 200, True
+            if action == "click" and element.get("href"):
+                self._navigate(session, element["href"])
+            if action == "value" and Keys.ENTER in payload["text"] and element.get("submit") is not None:
+                self._navigate(session, element["submit"] + quote(payload["text"].replace(Keys.ENTER, "")))
+            return 200, None
+        if command.startswith("execute/"):
+            script = payload["script"]
+            if "readyState" in script:
+                return 200, "complete"
+            if "scrollTo" in script:
+                session["scroll"] = 0 if "(0, 0)" in script else 1000
+                return 200, None
+            if "getEntriesByType" in script:
+                return 200, 0
+            if "scrollY" in script:
+                return 200, session["scroll"]
+            if "location.href" in script:
+                return 200, session["url"]
+            return 200, None
+        if command == "goog/cdp/execute":
+            # 성능 지표 수집용 응답 틀만 (값은 비어 있음)
+            if payload["cmd"] == "Performance.getMetrics":
+                return 200, {"metrics": []}
+            if payload["cmd"] == "Runtime.evaluate":
+                return 200, {"result": {"type": "object", "value": {"url": session["url"]}}}
+            return 200, {}
+        if command == "timeouts":
+            return 200, None
+        if command == "screenshot":
+            return 200, base64.b64encode(FAKE_PNG).decode()
+        return self._error(404, "unknown command", command)
+
+    def _navigate(self, session, url):
+        parts = urlsplit(url)
+        session["url"] = url if parts.scheme else f"{self.url}{url}"
+        session["path"] = parts.path or "/"
+        session["elements"] = {}
+        session["scroll"] = 0
+
+
+async def run_fake_check(sessions, latency_ms):
+    # 가짜 서버에 세션 N개를 동시에 열어 홈 → 검색 입력 → 결과 URL 확인 시나리오를 돌린다
+    server = await FakeWebDriverServer(latency_ms=latency_ms).start()
+    pool = ConnectionPool("127.0.0.1", server.port)
+
+    async def scenario(index):
+        async with open_session(pool, {"browserName": "chrome"}) as session:
+            await session.get(f"{server.url}/")
+            await wait_for_page_ready(session, 5, idle_ms=0)
+            element = await wait_until(session, clickable("search_input"), 5)
+            await element.send_keys(f"query {index}")
+            url = await wait_until(session, lambda s: _url_containing(s, "search"), 5)
+            return url
+
+    started = time.perf_counter()
+    try:
+        urls = await asyncio.gather(*(scenario(i) for i in range(sessions)))
+    finally:
+        await pool.close()
+        await server.stop()
+    elapsed = time.perf_counter() - started
+    return {"sessions": sessions, "ok": sum("search" in u for u in urls), "seconds": elapsed,
+            "server": server.stats, "pool": pool.stats}
+
+
+async def _url_containing(session, text):
+    url = await session.current_url()
+    return url if text in url else False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio WebDriver 클라이언트 - 가짜 서버로 동시 세션 확인")
+    parser.add_argument("--sessions", type=int, default=50, help="동시에 열 세션 수")
+    parser.add_argument("--latency-ms", type=int, default=20, help="가짜 서버 명령당 지연 (ms)")
+    args = parser.parse_args()
+    report = asyncio.run(run_fake_check(args.sessions, args.latency_ms))
+    print(f"⚡ 세션 {report['sessions']}개 중 {report['ok']}개 성공 / {report['seconds']:.2f}s")
+    print(f"   요청 {report['pool']['requests']}회 / TCP 연결 {report['pool']['opened']}개 "
+          f"(재사용 {report['pool']['reused']}회) / 서버 최대 동시 세션 {report['server']['max_sessions']}개")
+
+
+if __name__ == "__main__":
+    main()
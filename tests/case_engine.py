@@ -0,0 +1,290 @@
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException, TimeoutException,
+                                        WebDriverException)
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+import threading
+import time
+import zlib
+
+from assertions import AssertionBatchError
+from harness_log import get_logger, log_context
+from tracing import span
+from waits import case_budget, waiting
+
+# -----------------------------------------------------------------------------
+# 선언형 테스트 케이스 테이블 + 실행 엔진
+# -----------------------------------------------------------------------------
+# 케이스는 데이터(번호/분류/depth 경로/사전조건/기대결과 + step 함수)로만 정의한다.
+# step(driver)는 실패 시 예외를 던지기만 하면 되고, PASS/FAIL 기록은 엔진이 맡는다.
+
+MAX_DEPTH = 7
+
+log = get_logger("case_engine")
+
+
+@dataclass(frozen=True)
+class TestCase:
+    case_id: str
+    category: str
+    expected: str
+    step: Callable
+    depths: Tuple[str, ...] = ()
+    pre_condition: str = "-"
+    tags: Tuple[str, ...] = ()
+    resource_policy: str = "none"  # network_policy.RESOURCE_POLICIES 이름
+    retry_policy: str = "none"  # RETRY_POLICIES 이름
+    depends_on: Tuple[str, ...] = ()  # 선행 케이스 번호 (실패/BLOCKED면 이 케이스는 실행하지 않고 BLOCKED)
+    async_step: Optional[Callable] = None  # async_webdriver 세션용 step (await step(session)) - --async-sessions
+
+    # 시트/결과 양식에 맞춰 1depth~7depth를 "-"로 채운다
+    def depth_path(self):
+        depths = tuple(self.depths[:MAX_DEPTH])
+        return depths + ("-",) * (MAX_DEPTH - len(depths))
+
+
+# -----------------------------------------------------------------------------
+# 재시도 정책 (일시적인 실패 한 번으로 FAIL + 스크린샷 + 시트 기록까지 가지 않도록)
+# -----------------------------------------------------------------------------
+@dataclass(frozen=True)
+class RetryPolicy:
+    name: str
+    attempts: int = 1  # 첫 실행 포함 최대 실행 횟수
+    backoff: float = 0.0  # 첫 재시도 전 대기 (초)
+    backoff_factor: float = 2.0  # 재시도마다 대기 배수
+    retry_on: Tuple[type, ...] = (Exception,)  # 이 예외일 때만 재시도
+
+    def should_retry(self, error, attempt):
+        return attempt < self.attempts and isinstance(error, self.retry_on)
+
+    def delay(self, attempt):
+        return self.backoff * self.backoff_factor ** (attempt - 1)
+
+
+RETRY_POLICIES = {
+    "none": RetryPolicy("none"),
+    # 대기 시간 초과(요소/URL/조건 묶음)만 한 번 더
+    "timeouts": RetryPolicy("timeouts", attempts=2, backoff=1.0, retry_on=(TimeoutException, AssertionBatchError)),
+    # 드라이버 쪽 일시 오류까지 포함해 최대 3회
+    "transient": RetryPolicy("transient", attempts=3, backoff=1.0, retry_on=(
+        TimeoutException, AssertionBatchError, StaleElementReferenceException, WebDriverException)),
+}
+
+
+# -----------------------------------------------------------------------------
+# 케이스 의존 관계 + 서킷 브레이커 (실행해 봐야 타임아웃만 기다릴 케이스는 바로 BLOCKED)
+# -----------------------------------------------------------------------------
+class BlockedError(Exception):
+    pass
+
+
+# 앱 동작 실패가 아니라 실행 환경(브라우저/네트워크/세션)이 망가졌다는 신호
+ENVIRONMENT_ERROR_MARKERS = (
+    "net::ERR_", "chrome not reachable", "invalid session id", "session deleted", "disconnected",
+    "no such window", "Max retries exceeded", "Connection refused", "Connection reset",
+)
+
+
+def is_environment_failure(error):
+    # error: 예외 객체 또는 결과에 남은 오류 문자열
+    if isinstance(error, (TimeoutException, NoSuchElementException, StaleElementReferenceException,
+                          AssertionBatchError, BlockedError)):
+        return False
+    if isinstance(error, ConnectionError):
+        return True
+    message = str(error or "")
+    return any(marker in message for marker in ENVIRONMENT_ERROR_MARKERS)
+
+
+class CircuitBreaker:
+    # 환경 오류로 인한 FAIL이 threshold회 연속이면 열림 → 이후 케이스는 전부 BLOCKED (0이면 사용 안 함)
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.consecutive = 0
+        self.tripped_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def open(self):
+        return bool(self.threshold) and self.consecutive >= self.threshold
+
+    def record(self, case_id, result, error=None):
+        with self._lock:
+            if result == "BLOCKED" or self.open:
+                return
+            if result == "FAIL" and is_environment_failure(error):
+                self.consecutive += 1
+                if self.open:
+                    self.tripped_at = case_id
+                    log.warning(f"🧯 서킷 브레이커 작동: 환경 오류 {self.consecutive}회 연속 (Case #{case_id}) - 남은 케이스는 BLOCKED 처리")
+            else:
+                self.consecutive = 0
+
+
+def blocked_reason(case, outcomes, breaker=None):
+    # outcomes: 케이스 번호 → 결과. 이번 실행에 없는 선행 케이스는 통과한 것으로 본다
+    if breaker is not None and breaker.open:
+        return f"서킷 브레이커 작동 (환경 오류 {breaker.threshold}회 연속, Case #{breaker.tripped_at})"
+    failed = [dep for dep in case.depends_on if outcomes.get(dep) in ("FAIL", "BLOCKED")]
+    if failed:
+        return "선행 케이스 실패: " + ", ".join(f"#{dep}" for dep in failed)
+    return None
+
+
+def dependency_waves(cases):
+    # 병렬 실행용 단계 분리: 같은 단계의 케이스끼리는 서로 의존하지 않는다 (순서는 입력 순서 유지)
+    ids = {c.case_id for c in cases}
+    done, waves, remaining = set(), [], list(cases)
+    while remaining:
+        wave = [c for c in remaining if all(dep in done or dep not in ids for dep in c.depends_on)]
+        if not wave:
+            raise ValueError(f"케이스 의존 관계에 순환이 있습니다: {', '.join(c.case_id for c in remaining)}")
+        waves.append(wave)
+        done.update(c.case_id for c in wave)
+        remaining = [c for c in remaining if c.case_id not in done]
+    return waves
+
+
+def dependents_of(cases, ids):
+    # ids 케이스에 (간접적으로라도) 의존하는 케이스 번호 집합 (ids 자신은 제외)
+    found, changed = set(), True
+    while changed:
+        changed = False
+        for case in cases:
+            if case.case_id not in found and case.case_id not in ids \
+                    and any(dep in ids or dep in found for dep in case.depends_on):
+                found.add(case.case_id)
+                changed = True
+    return found
+
+
+def block_case(driver, case, log_result, reason):
+    with log_context(case=case.case_id):
+        log.warning(f"⛔ Case #{case.case_id} 건너뜀: {reason}")
+        log_result(driver, case, "BLOCKED", BlockedError(reason))
+    return "BLOCKED"
+
+
+def select_cases(cases, ids=None, categories=None, tags=None):
+    # ids를 주면 그 순서대로 재정렬 (예: --cases 3,1)
+    selected = list(cases)
+    if categories:
+        selected = [c for c in selected if c.category in categories]
+    if tags:
+        selected = [c for c in selected if set(tags) & set(c.tags)]
+    if ids:
+        by_id = {c.case_id: c for c in selected}
+        unknown = [case_id for case_id in ids if case_id not in by_id]
+        if unknown:
+            raise ValueError(f"알 수 없는 케이스 번호: {', '.join(unknown)}")
+        selected = [by_id[case_id] for case_id in ids]
+    return selected
+
+
+# -----------------------------------------------------------------------------
+# 샤딩 (--shard i/N): CI 러너 N대가 케이스를 겹치지 않게 나눠 실행
+# -----------------------------------------------------------------------------
+SHARD_STRATEGIES = ("hash", "timing")
+
+
+def parse_shard(value):
+    # "2/4" → (2, 4)  (1부터 시작)
+    index, _, total = value.partition("/")
+    index, total = int(index), int(total)
+    if not 1 <= index <= total:
+        raise ValueError(f"잘못된 샤드 지정: {value} (1 <= i <= N)")
+    return index, total
+
+
+def assign_shards(cases, total, strategy="hash", durations=None):
+    # 케이스 → 샤드 번호(0부터) 매핑. 같은 입력이면 어느 러너에서 계산해도 결과가 같다.
+    if strategy == "timing" and durations:
+        # 소요 시간 긴 케이스부터 현재 가장 가벼운 샤드에 배정 (LPT)
+        # 기록이 없는 케이스는 기록된 값들의 평균으로 추정
+        known = [durations[c.case_id] for c in cases if c.case_id in durations]
+        default = sum(known) / len(known) if known else 1.0
+        loads = [0.0] * total
+        assignment = {}
+        ordered = sorted(cases, key=lambda c: (-durations.get(c.case_id, default), c.case_id))
+        for case in ordered:
+            shard = min(range(total), key=lambda i: (loads[i], i))
+            assignment[case.case_id] = shard
+            loads[shard] += durations.get(case.case_id, default)
+        return assignment
+    # 해시: 케이스 번호의 CRC32 순서로 줄 세운 뒤 돌아가며 배정 (샤드별 케이스 수 차이는 최대 1)
+    # 나머지 연산만 쓰면 "1","2","3" 같은 짧은 번호가 한 샤드에 몰린다. 파이썬 hash()는 실행마다 달라서 사용 불가
+    ordered = sorted(cases, key=lambda c: (zlib.crc32(c.case_id.encode("utf-8")), c.case_id))
+    return {case.case_id: i % total for i, case in enumerate(ordered)}
+
+
+def shard_cases(cases, index, total, strategy="hash", durations=None):
+    assignment = assign_shards(cases, total, strategy, durations)
+    return [c for c in cases if assignment[c.case_id] == index - 1]
+
+
+def _run_attempts(driver, case, budget, before_retry):
+    # 재시도 정책에 따라 step 실행. 마지막 시도의 예외(없으면 None)를 돌려준다
+    policy = RETRY_POLICIES[case.retry_policy]
+    while True:
+        try:
+            with span("case.attempt", {"case.attempt": budget.attempts}):
+                case.step(driver)
+            return None
+        except Exception as e:
+            if not policy.should_retry(e, budget.attempts):
+                return e
+            log.warning(f"🔁 Case #{case.case_id} 재시도 ({budget.attempts}/{policy.attempts - 1}, {type(e).__name__})")
+        with waiting("retry backoff"):
+            time.sleep(policy.delay(budget.attempts))
+        budget.attempts += 1
+        if before_retry:
+            try:
+                before_retry(driver, case)
+            except Exception as e:
+                return e
+
+
+def _run_setup(driver, case, before_each):
+    # 케이스 준비(정책 적용/홈 이동) 실패도 이 케이스의 FAIL로 기록한다 (예외가 레인 밖으로 새지 않도록)
+    try:
+        with span("case.setup", {"case.id": case.case_id}):
+            before_each(driver, case)
+        return None
+    except Exception as e:
+        log.warning(f"⚠️ Case #{case.case_id} 준비 실패: {type(e).__name__}")
+        return e
+
+
+def run_case(driver, case, log_result, before_retry: Optional[Callable] = None, breaker: Optional[CircuitBreaker] = None,
+             before_each: Optional[Callable] = None):
+    # log_result(driver, case, result, exception_obj) : 결과 한 건 기록 (재시도 중간 실패는 기록하지 않음)
+    # before_each(driver, case)                      : 케이스 시작 전 준비 (실패하면 step 없이 FAIL)
+    # before_retry(driver, case)                     : 재시도 전에 화면 상태 되돌리기 (홈 이동 등)
+    # 기록 시점에 waits.current_budget()으로 이 케이스의 대기/동작 시간과 실행 횟수를 읽을 수 있다
+    with case_budget(case.case_id) as budget, log_context(case=case.case_id), \
+            span("case", {"case.id": case.case_id, "case.category": case.category}) as current:
+        error = _run_setup(driver, case, before_each) if before_each else None
+        if error is None:
+            error = _run_attempts(driver, case, budget, before_retry)
+        if breaker is not None:
+            breaker.record(case.case_id, "FAIL" if error is not None else "PASS", error)
+        if error is not None:
+            if current is not None:
+                current.record_failure(error, outcome="fail")
+            log_result(driver, case, "FAIL", error)
+            return "FAIL"
+        log_result(driver, case, "PASS", None)
+        return "PASS"
+
+
+def run_cases(driver, cases, log_result, before_each: Optional[Callable] = None, before_retry: Optional[Callable] = None,
+              breaker: Optional[CircuitBreaker] = None, outcomes: Optional[dict] = None):
+    # outcomes: 케이스 번호 → 결과 (넘기면 이어서 채운다 - 이전 레인의 결과로 의존 관계 판단)
+    outcomes = {} if outcomes is None else outcomes
+    for case in cases:
+        reason = blocked_reason(case, outcomes, breaker)
+        if reason:
+            outcomes[case.case_id] = block_case(driver, case, log_result, reason)
+            continue
+        outcomes[case.case_id] = run_case(driver, case, log_result, before_retry, breaker, before_each)
+    return [outcomes[c.case_id] for c in cases]
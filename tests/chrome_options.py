@@ -0,0 +1,113 @@
+from selenium.webdriver.chrome.options import Options
+
+import os
+
+# -----------------------------------------------------------------------------
+# Selenium Chrome 옵션 설정 (헤드리스 모바일 모드)
+# -----------------------------------------------------------------------------
+# 실행 프로필
+#  - default : 기존 옵션 그대로
+#  - ci-fast : CI용 경량 실행 (이미지/웹폰트 차단, 백그라운드 통신·확장·GPU 합성·컴포넌트 업데이트 끔,
+#              실행 간 재사용되는 디스크 캐시 폴더 사용)
+#              이미지/폰트가 필요한 케이스(화면 비교 등)는 default 프로필로 실행한다.
+LAUNCH_PROFILES = ("default", "ci-fast")
+
+# 디스크 캐시 루트 (CI에서는 actions/cache로 이 폴더를 보존하면 실행 간 재사용)
+CHROME_CACHE_DIR = os.environ.get("CHROME_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "daum-web-tests", "chrome")
+
+# 에뮬레이션 기기 프로필 (--devices 매트릭스 실행)
+#  - emulation: ChromeDriver mobileEmulation 값 (None이면 데스크톱 - 에뮬레이션 없음)
+#  - window   : 창 크기 (start_chrome이 --window-size 인자를 읽어 맞춘다)
+# 기본 기기는 기존과 같은 갤럭시 S20 Ultra. 나머지는 ChromeDriver 기기 목록 버전 차이를 피하려고 수치를 직접 지정한다.
+DEFAULT_DEVICE = "galaxy-s20-ultra"
+DEVICE_PROFILES = {
+    "galaxy-s20-ultra": {"emulation": {"deviceName": "Samsung Galaxy S20 Ultra"}, "window": (412, 915)},
+    "pixel-7": {
+        "emulation": {
+            "deviceMetrics": {"width": 412, "height": 915, "pixelRatio": 2.625, "touch": True},
+            "userAgent": "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 (KHTML, like Gecko) "
+                         "Chrome/120.0.0.0 Mobile Safari/537.36",
+        },
+        "window": (412, 915),
+    },
+    "iphone-12-pro": {
+        "emulation": {
+            "deviceMetrics": {"width": 390, "height": 844, "pixelRatio": 3.0, "touch": True},
+            "userAgent": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 "
+                         "(KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1",
+        },
+        "window": (390, 844),
+    },
+    "ipad-mini": {
+        "emulation": {
+            "deviceMetrics": {"width": 768, "height": 1024, "pixelRatio": 2.0, "touch": True},
+            "userAgent": "Mozilla/5.0 (iPad; CPU OS 16_0 like Mac OS X) AppleWebKit/605.1.15 "
+                         "(KHTML, like Gecko) Version/16.0 Mobile/15E148 Safari/604.1",
+        },
+        "window": (768, 1024),
+    },
+    "desktop-1280": {"emulation": None, "window": (1280, 800)},
+    "desktop-1920": {"emulation": None, "window": (1920, 1080)},
+}
+
+CI_FAST_ARGUMENTS = [
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-gpu-compositing",
+    "--disable-remote-fonts",
+    "--disable-sync",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication",
+    "--metrics-recording-only",
+    "--no-default-browser-check",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def build_chrome_options(user_data_dir=None, cache_slot=0, profile="default", network_log=False, device=DEFAULT_DEVICE,
+                         host_rules=None):
+    if profile not in LAUNCH_PROFILES:
+        raise ValueError(f"알 수 없는 실행 프로필: {profile}")
+    if device not in DEVICE_PROFILES:
+        raise ValueError(f"알 수 없는 기기 프로필: {device}")
+    device_profile = DEVICE_PROFILES[device]
+    options = Options()
+    # 1. GitHub Actions에서 실행하기 위한 필수 옵션 (헤드리스)
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size={},{}".format(*device_profile["window"])) # 기본: 갤럭시 S20 크기
+
+    # 2. 모바일 기기인 척 속이기 (User-Agent & Viewport) - 데스크톱 프로필은 에뮬레이션 없음
+    mobile_emulation = device_profile["emulation"]
+    if mobile_emulation:
+        options.add_experimental_option("mobileEmulation", mobile_emulation)
+
+    # 3. 병렬 세션은 각자 독립된 프로필 폴더를 사용 (쿠키/캐시 공유 방지)
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    # 4. 네트워크 이벤트 수집용 성능 로그 (케이스별 차단/전송량 집계 - network_policy.py)
+    if network_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    # 4-1. 호스트 이름 해석 규칙 (--replay: 모든 호스트를 로컬 재생 서버로 - 녹화 안 된 호스트도 실제 네트워크로 나가지 않음)
+    if host_rules:
+        options.add_argument(f"--host-resolver-rules={host_rules}")
+
+    # 5. CI 경량 프로필
+    if profile == "ci-fast":
+        for argument in CI_FAST_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+        # 동시에 뜬 세션끼리 캐시 폴더를 같이 쓰지 않도록 슬롯(세션 번호)별로 나눈다
+        cache_dir = os.path.join(CHROME_CACHE_DIR, f"slot-{cache_slot}")
+        os.makedirs(cache_dir, exist_ok=True)
+        options.add_argument(f"--disk-cache-dir={cache_dir}")
+    return options
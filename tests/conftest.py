@@ -0,0 +1,29 @@
+import pytest
+
+import case_engine
+
+# -----------------------------------------------------------------------------
+# 하네스 자체 확인용 공용 픽스처 (tests/test_*.py)
+# -----------------------------------------------------------------------------
+# Chrome, 구글 계정, API 키 없이 돈다:  python -m pytest tests
+
+
+@pytest.fixture
+def make_case():
+    # (TestCase 이름을 직접 import 하면 pytest가 테스트 클래스로 수집하려 한다)
+    def make(case_id, step, **kwargs):
+        return case_engine.TestCase(case_id, "확인", f"Case {case_id}", step, **kwargs)
+
+    return make
+
+
+@pytest.fixture
+def recorder():
+    # run_cases 의 log_result 자리 - (케이스 번호, 결과, 오류) 를 rows 에 모은다
+    rows = []
+
+    def log_result(driver, case, result, error):
+        rows.append((case.case_id, result, error))
+
+    log_result.rows = rows
+    return log_result
@@ -0,0 +1,327 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.common.exceptions import WebDriverException
+
+from multiprocessing.connection import Listener, Client
+from contextlib import contextmanager
+import argparse
+import functools
+import itertools
+import os
+import queue
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+
+from chrome_options import LAUNCH_PROFILES, build_chrome_options
+from driver_pool import start_chrome
+from harness_log import get_logger
+from tracing import instrument_driver
+
+# -----------------------------------------------------------------------------
+# 워밍업된 Chrome 세션 브로커 (테스트 스크립트 간 브라우저 재사용)
+# -----------------------------------------------------------------------------
+# 브로커 실행:  python tests/driver_broker.py --size 2 --max-uses 20
+# 스크립트 쪽:  python tests/daum_search_v8.py --broker 127.0.0.1:7766
+#
+# 브로커가 모바일 에뮬레이션 옵션으로 미리 띄운 헤드리스 세션을 빌려주고(lease),
+# 반납 시 모든 origin의 쿠키/스토리지를 지우고 새 탭(about:blank) 하나만 남긴다.
+# M회 사용했거나 응답이 없는(크래시) 세션은 종료 후 새로 띄운다 (실패하면 간격을 두고 다시).
+#
+# 인증 키: DRIVER_BROKER_AUTHKEY 환경 변수, 없으면 키 파일(DRIVER_BROKER_AUTHKEY_FILE, 기본 ~/.cache/daum-web-tests/).
+# 브로커는 키 파일이 없으면 임의의 키를 만들어 본인만 읽을 수 있게(0600) 저장하고, 클라이언트는 같은 파일을 읽는다.
+
+DEFAULT_ADDRESS = ("127.0.0.1", 7766)
+LEASE_TIMEOUT = 120  # 대기 세션이 이 시간(초) 안에 안 생기면 클라이언트에 오류 응답
+RESPAWN_DELAYS = (1, 5, 15, 30)  # 재생성 실패 시 재시도 간격 (마지막 값으로 계속)
+
+# 반납 시 모든 origin의 저장소를 지운다 (쿠키는 Network.clearBrowserCookies로 브라우저 전체)
+CLEAR_STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+# 이번 대여 동안 저장소를 썼을 수 있는 origin: 현재 문서 + 리소스(광고/iframe 등)의 origin
+ORIGINS_SCRIPT = ("return [location.origin].concat(performance.getEntriesByType('resource')"
+                  ".map(function (e) { try { return new URL(e.name).origin; } catch (err) { return ''; } }))")
+AUTHKEY_ENV = "DRIVER_BROKER_AUTHKEY"
+AUTHKEY_FILE = os.environ.get("DRIVER_BROKER_AUTHKEY_FILE") or os.path.join(
+    os.path.expanduser("~"), ".cache", "daum-web-tests", "driver_broker.key")
+
+log = get_logger("driver_broker")
+
+
+def load_authkey(path=AUTHKEY_FILE, create=False):
+    # 환경 변수 > 키 파일. create=True(브로커)면 키 파일이 없을 때 새로 만든다
+    if os.environ.get(AUTHKEY_ENV):
+        return os.environ[AUTHKEY_ENV].encode()
+    if create and not os.path.exists(path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # 동시에 뜬 다른 브로커가 먼저 만들었으면 그 키를 쓴다
+        else:
+            with os.fdopen(fd, "w") as f:
+                f.write(secrets.token_hex(32))
+            log.info(f"🔑 브로커 인증 키 생성: {path}")
+    if not os.path.exists(path):
+        raise RuntimeError(f"브로커 인증 키가 없습니다: {AUTHKEY_ENV} 환경 변수 또는 {path} (브로커를 먼저 실행하세요)")
+    if os.stat(path).st_mode & 0o077:
+        raise RuntimeError(f"브로커 인증 키 파일을 다른 사용자가 읽을 수 있습니다: {path} (chmod 600)")
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip().encode()
+
+
+class _WarmSession:
+    def __init__(self, driver, profile_dir, slot, network_log=False):
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.slot = slot
+        self.network_log = network_log
+        self.uses = 0
+
+    def lease_info(self, lease_id):
+        return {
+            "lease_id": lease_id,
+            "executor_url": self.driver.service.service_url,
+            "session_id": self.driver.session_id,
+            "network_log": self.network_log,  # 성능 로그 수집 여부 (클라이언트의 네트워크 집계 판단용)
+        }
+
+
+class DriverBroker:
+    def __init__(self, size, max_uses, options_factory=build_chrome_options):
+        self.size = size
+        self.max_uses = max_uses
+        self._options_factory = options_factory
+        self._idle = queue.Queue()
+        self._leased = {}
+        self._lease_ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _spawn(self, slot):
+        profile_dir = tempfile.mkdtemp(prefix="chrome_broker_")
+        options = self._options_factory(profile_dir, slot)
+        driver = start_chrome(options)
+        driver.get("about:blank")
+        return _WarmSession(driver, profile_dir, slot, "goog:loggingPrefs" in options.to_capabilities())
+
+    def _discard(self, session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        shutil.rmtree(session.profile_dir, ignore_errors=True)
+
+    def warm_up(self):
+        for slot in range(self.size):
+            self._idle.put(self._spawn(slot))
+        log.info(f"✅ 워밍업 완료: 세션 {self.size}개 대기 중")
+
+    def lease(self, timeout=LEASE_TIMEOUT):
+        try:
+            session = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"{timeout}초 안에 대여 가능한 세션이 없습니다 (세션 재생성 실패 여부는 브로커 로그 확인)") from None
+        with self._lock:
+            lease_id = next(self._lease_ids)
+            session.uses += 1
+            self._leased[lease_id] = session
+        return session.lease_info(lease_id)
+
+    def _storage_origins(self, driver):
+        origins = set(driver.execute_script(ORIGINS_SCRIPT) or [])
+        # 쿠키를 남긴 도메인 (다른 탭/이전 페이지에서 방문한 origin 포함)
+        for cookie in driver.execute_cdp_cmd("Storage.getCookies", {}).get("cookies", []):
+            host = cookie["domain"].lstrip(".")
+            origins.update((f"https://{host}", f"http://{host}"))
+        return sorted(o for o in origins if o.startswith("http"))
+
+    def _reset(self, session):
+        driver = session.driver
+        origins = self._storage_origins(driver)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": CLEAR_STORAGE_TYPES})
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        # sessionStorage는 탭(최상위 문서)마다 따로라서 새 탭을 열고 기존 탭을 모두 닫는다
+        old_handles = driver.window_handles
+        driver.switch_to.new_window("tab")
+        fresh = driver.current_window_handle
+        for handle in old_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(fresh)
+        driver.get("about:blank")
+
+    def release(self, lease_id, crashed=False):
+        with self._lock:
+            session = self._leased.pop(lease_id, None)
+        if session is None:
+            return
+        if not crashed and session.uses < self.max_uses:
+            try:
+                self._reset(session)
+                self._idle.put(session)
+                return
+            except Exception as e:
+                log.warning(f"⚠️ 세션 초기화 실패 (재생성): {e}")
+        # 사용 횟수 초과 또는 크래시 → 재생성 (반납한 클라이언트는 기다리지 않도록 백그라운드에서)
+        threading.Thread(target=self._replace, args=(session,), daemon=True).start()
+
+    def _replace(self, session):
+        # 재생성이 실패해도 슬롯을 잃지 않도록 간격을 두고 계속 시도 (그동안 lease()는 타임아웃으로 오류 응답)
+        self._discard(session)
+        for attempt in itertools.count(1):
+            try:
+                self._idle.put(self._spawn(session.slot))
+                if attempt > 1:
+                    log.info(f"✅ 세션 {session.slot} 재생성 성공 ({attempt}번째 시도)")
+                return
+            except Exception as e:
+                delay = RESPAWN_DELAYS[min(attempt, len(RESPAWN_DELAYS)) - 1]
+                log.error(f"❌ 세션 {session.slot} 재생성 실패 ({attempt}번째, {delay}초 뒤 재시도): {e}")
+                time.sleep(delay)
+
+    def status(self):
+        with self._lock:
+            return {"idle": self._idle.qsize(), "leased": len(self._leased), "size": self.size}
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._leased.values())
+            self._leased.clear()
+        while not self._idle.empty():
+            sessions.append(self._idle.get_nowait())
+        for session in sessions:
+            self._discard(session)
+
+    # --- 연결 하나당 스레드 하나: 요청 (명령, 인자...) → 응답 ---
+    def _serve_connection(self, conn):
+        held = set()
+        try:
+            while True:
+                try:
+                    command, *params = conn.recv()
+                except EOFError:
+                    break
+                if command == "lease":
+                    try:
+                        info = self.lease()
+                    except TimeoutError as e:
+                        conn.send({"error": str(e)})
+                        continue
+                    held.add(info["lease_id"])
+                    conn.send(info)
+                elif command == "release":
+                    lease_id, crashed = params
+                    held.discard(lease_id)
+                    self.release(lease_id, crashed)
+                    conn.send(True)
+                elif command == "status":
+                    conn.send(self.status())
+                else:
+                    conn.send({"error": f"unknown command: {command}"})
+        finally:
+            # 반납 없이 끊긴 클라이언트의 세션은 상태를 알 수 없으므로 재생성
+            for lease_id in held:
+                self.release(lease_id, crashed=True)
+            conn.close()
+
+    def serve_forever(self, address=DEFAULT_ADDRESS, authkey=None):
+        authkey = authkey or load_authkey(create=True)
+        self.warm_up()
+        with Listener(address, authkey=authkey) as listener:
+            log.info(f"🛰️ 드라이버 브로커 대기 중: {address[0]}:{address[1]}")
+            try:
+                while True:
+                    conn = listener.accept()
+                    threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+            except KeyboardInterrupt:
+                log.info("\n🛑 브로커를 종료합니다.")
+            finally:
+                self.close()
+
+
+# -----------------------------------------------------------------------------
+# 클라이언트: 브로커 세션에 붙는 Remote 드라이버
+# -----------------------------------------------------------------------------
+class AttachedChromeDriver(webdriver.Remote):
+    # 새 세션을 만들지 않고 기존 session_id에 연결한다
+    def __init__(self, executor_url, session_id):
+        self._attach_session_id = session_id
+        connection = ChromiumRemoteConnection(executor_url, vendor_prefix="goog", browser_name="chrome")
+        super().__init__(command_executor=connection, options=Options())
+
+    def start_session(self, capabilities, *args, **kwargs):
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self):
+        # 세션 종료는 브로커 몫 (반납은 BrokerClient.release)
+        pass
+
+
+def parse_address(value):
+    host, _, port = value.rpartition(":")
+    return (host or DEFAULT_ADDRESS[0], int(port))
+
+
+class BrokerClient:
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None):
+        self._conn = Client(address, authkey=authkey or load_authkey())
+        self._lock = threading.Lock()
+
+    def _call(self, *message):
+        with self._lock:
+            self._conn.send(message)
+            return self._conn.recv()
+
+    def acquire(self):
+        info = self._call("lease")
+        if "error" in info:
+            raise WebDriverException(f"브로커 세션 대여 실패: {info['error']}")
+        driver = instrument_driver(AttachedChromeDriver(info["executor_url"], info["session_id"]))
+        driver.lease_id = info["lease_id"]
+        driver.network_log = info.get("network_log", False)
+        return driver
+
+    def release(self, driver, crashed=False):
+        self._call("release", driver.lease_id, crashed)
+
+    @contextmanager
+    def lease(self):
+        driver = self.acquire()
+        crashed = False
+        try:
+            yield driver
+        except Exception:
+            crashed = True
+            raise
+        finally:
+            self.release(driver, crashed)
+
+    def status(self):
+        return self._call("status")
+
+    def close(self):
+        self._conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="워밍업된 헤드리스 Chrome 세션 브로커")
+    parser.add_argument("--address", type=parse_address, default=DEFAULT_ADDRESS, help="대기 주소 (host:port)")
+    parser.add_argument("--size", type=int, default=2, help="미리 띄워둘 세션 수")
+    parser.add_argument("--max-uses", type=int, default=20, help="세션 재생성 전까지 최대 대여 횟수")
+    parser.add_argument("--profile", choices=LAUNCH_PROFILES, default="default", help="Chrome 실행 프로필")
+    parser.add_argument("--network-log", action="store_true", help="성능 로그 수집 (케이스별 네트워크 차단/절약량 집계용)")
+    parser.add_argument("--authkey-file", default=AUTHKEY_FILE,
+                        help=f"인증 키 파일 (없으면 새로 생성, {AUTHKEY_ENV} 환경 변수가 있으면 그 값을 사용)")
+    args = parser.parse_args()
+    factory = functools.partial(build_chrome_options, profile=args.profile, network_log=args.network_log)
+    DriverBroker(args.size, args.max_uses, options_factory=factory).serve_forever(
+        args.address, load_authkey(args.authkey_file, create=True))
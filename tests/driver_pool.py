@@ -0,0 +1,161 @@
+from selenium import webdriver
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import multiprocessing.util
+import queue
+import shutil
+import tempfile
+import threading
+
+from harness_log import get_logger
+from tracing import instrument_driver
+
+# -----------------------------------------------------------------------------
+# 헤드리스 Chrome 세션 풀 (케이스 병렬 실행용)
+# -----------------------------------------------------------------------------
+# options_factory(user_data_dir, cache_slot) -> Options : 세션마다 독립된 프로필 폴더 + 세션 번호로 옵션 생성
+# run_one(driver, case) -> list                         : 케이스 하나를 실행하고 결과 행 목록을 반환
+
+WINDOW_SIZE = (412, 915)
+
+log = get_logger("driver_pool")
+
+
+def window_size_of(options):
+    # 옵션의 --window-size 인자 (기기 프로필별 크기), 없으면 기본 모바일 크기
+    for argument in options.arguments:
+        if argument.startswith("--window-size="):
+            width, height = argument.split("=", 1)[1].split(",")
+            return int(width), int(height)
+    return WINDOW_SIZE
+
+
+def start_chrome(options):
+    driver = instrument_driver(webdriver.Chrome(options=options))
+    # 윈도우 크기 강제 설정 (기기 프로필 비율)
+    driver.set_window_size(*window_size_of(options))
+    return driver
+
+
+class ChromeSessionPool:
+    def __init__(self, size, options_factory):
+        self.size = size
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._profile_dirs = []
+        self._lock = threading.Lock()
+        self._options_factory = options_factory
+
+    def start(self):
+        # 세션은 병렬로 띄운다 (Chrome 기동 시간이 세션 수만큼 누적되지 않도록)
+        # 하나라도 실패하면 __exit__가 불리지 않으므로 이미 뜬 세션/프로필 폴더는 여기서 정리
+        try:
+            with ThreadPoolExecutor(max_workers=self.size) as executor:
+                for driver in executor.map(self._spawn, range(self.size)):
+                    self._idle.put(driver)
+        except Exception:
+            self.close()
+            raise
+        log.info(f"✅ Chrome 세션 풀 준비 완료 ({self.size}개)")
+        return self
+
+    def _spawn(self, slot):
+        profile_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+        try:
+            driver = start_chrome(self._options_factory(profile_dir, slot))
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+        with self._lock:
+            self._profile_dirs.append(profile_dir)
+            self._drivers.append(driver)
+        return driver
+
+    def acquire(self):
+        return self._idle.get()
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def close(self):
+        for driver in self._drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                log.warning(f"⚠️ 세션 종료 중 오류: {e}")
+        for profile_dir in self._profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        self._drivers.clear()
+        self._profile_dirs.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+# --- 스레드 기반 실행: 하나의 프로세스에서 세션 풀을 공유 ---
+def _run_threaded(cases, workers, options_factory, run_one, schedule):
+    with ChromeSessionPool(workers, options_factory) as pool:
+
+        def task(index, case):
+            driver = pool.acquire()
+            try:
+                return index, run_one(driver, case)
+            finally:
+                pool.release(driver)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(task, i, cases[i]) for i in schedule]
+            return [f.result() for f in futures]
+
+
+# --- 프로세스 기반 실행: 워커 프로세스마다 전용 세션 1개 ---
+_worker_driver = None
+_worker_run_one = None
+
+
+def _init_process_worker(options_factory, run_one, slot_counter):
+    global _worker_driver, _worker_run_one
+    # 워커마다 고유한 세션 번호 (캐시 폴더 구분용)
+    with slot_counter.get_lock():
+        slot = slot_counter.value
+        slot_counter.value += 1
+    profile_dir = tempfile.mkdtemp(prefix="chrome_profile_")
+    _worker_driver = start_chrome(options_factory(profile_dir, slot))
+    _worker_run_one = run_one
+    # 워커 프로세스가 끝날 때 브라우저와 프로필 폴더 정리
+    multiprocessing.util.Finalize(None, shutil.rmtree, args=(profile_dir, True), exitpriority=10)
+    multiprocessing.util.Finalize(None, _worker_driver.quit, exitpriority=20)
+
+
+def _run_in_process_worker(index, case):
+    return index, _worker_run_one(_worker_driver, case)
+
+
+def _run_processes(cases, workers, options_factory, run_one, schedule):
+    slot_counter = multiprocessing.Value("i", 0)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker,
+                             initargs=(options_factory, run_one, slot_counter)) as executor:
+        futures = [executor.submit(_run_in_process_worker, i, cases[i]) for i in schedule]
+        return [f.result() for f in futures]
+
+
+def run_cases_parallel(cases, workers, options_factory, run_one, backend="thread", schedule=None):
+    # schedule: 실행(제출) 순서의 케이스 인덱스 목록 - 빈 세션이 다음 케이스를 가져가므로
+    #           긴 케이스부터 넣으면 LPT 스케줄이 된다. 결과 순서는 항상 cases 순서.
+    workers = max(1, min(workers, len(cases)))
+    schedule = list(range(len(cases))) if schedule is None else schedule
+    log.info(f"⚡ 병렬 실행: 케이스 {len(cases)}개 / 세션 {workers}개 ({backend})")
+    if backend == "process":
+        outcomes = _run_processes(cases, workers, options_factory, run_one, schedule)
+    else:
+        outcomes = _run_threaded(cases, workers, options_factory, run_one, schedule)
+
+    # 완료 순서와 무관하게 케이스 순서대로 결과를 합친다
+    merged = []
+    for _, rows in sorted(outcomes, key=lambda item: item[0]):
+        merged.extend(rows)
+    return merged
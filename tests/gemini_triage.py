@@ -0,0 +1,242 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+import base64
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import requests
+
+from harness_log import get_logger
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# -----------------------------------------------------------------------------
+# 실패 원인 AI 분석 (Gemini) - 비동기 큐 + 동시성 제한 + 속도 제한 + 캐시
+# -----------------------------------------------------------------------------
+# 실패 시 (스크린샷, 에러)를 큐에 넣기만 하고 테스트는 계속 진행한다.
+# 같은 화면(지각 해시) + 같은 에러(정규화 메시지) 조합은 캐시된 판정을 재사용 → API 호출 없음.
+
+log = get_logger("gemini_triage")
+
+PROMPT = (
+    "다음은 모바일 웹 자동화 테스트 실패 화면과 에러 메시지입니다. "
+    "실패 원인을 '제품 결함 / 테스트 스크립트 문제 / 환경(네트워크 등) 문제' 중 하나로 분류하고 "
+    "한두 문장으로 근거를 설명하세요.\n\n에러: {error}"
+)
+
+
+# --- 토큰 버킷: 초당 rate개, 최대 burst개까지 몰아서 허용 ---
+class TokenBucket:
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+# --- 캐시 키 구성 요소 ---
+def normalize_error(message):
+    # 스택트레이스/세션 ID/좌표/시간 등 실행마다 달라지는 부분을 지운다
+    text = (message or "").split("Stacktrace:")[0].strip().lower()
+    text = re.sub(r"0x[0-9a-f]+", "<addr>", text)
+    text = re.sub(r"[0-9a-f]{16,}", "<id>", text)
+    text = re.sub(r"\d+(\.\d+)?", "#", text)
+    text = re.sub(r"\s+", " ", text)
+    return text[:300]
+
+
+def perceptual_hash(png_bytes, size=8):
+    # dHash: 가로로 인접한 픽셀 밝기 비교 64비트 (미세한 렌더링 차이에도 같은 값)
+    if not PIL_AVAILABLE or not png_bytes:
+        return hashlib.sha1(png_bytes or b"").hexdigest()
+    image = Image.open(BytesIO(png_bytes)).convert("L").resize((size + 1, size), Image.BILINEAR)
+    pixels = list(image.getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{size * size // 4}x}"
+
+
+def triage_key(png_bytes, error_message):
+    return f"{perceptual_hash(png_bytes)}:{hashlib.sha1(normalize_error(error_message).encode()).hexdigest()[:16]}"
+
+
+# -----------------------------------------------------------------------------
+# 모델 클라이언트
+# -----------------------------------------------------------------------------
+class GeminiModel:
+    def __init__(self, api_key, model_name="gemini-1.5-flash"):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+
+    def analyze(self, png_bytes, error_message):
+        parts = [PROMPT.format(error=error_message)]
+        if png_bytes and PIL_AVAILABLE:
+            parts.append(Image.open(BytesIO(png_bytes)))
+        return self._model.generate_content(parts).text.strip()
+
+
+class HttpModel:
+    # 로컬 스텁 서버(StubModelServer) 등 JSON HTTP 엔드포인트용
+    def __init__(self, url, timeout=30):
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def analyze(self, png_bytes, error_message):
+        payload = {
+            "prompt": PROMPT.format(error=error_message),
+            "image_base64": base64.b64encode(png_bytes or b"").decode(),
+        }
+        response = self._session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()["verdict"]
+
+
+class StubModelServer:
+    # 오프라인 확인용 가짜 모델 서버: 지연 후 고정 형식의 판정을 돌려주고 호출 수를 센다
+    def __init__(self, latency=0.2, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub.requests += 1
+                time.sleep(stub.latency)
+                digest = hashlib.sha1(body.get("prompt", "").encode()).hexdigest()[:8]
+                data = json.dumps({"verdict": f"[stub] 환경 문제로 추정 ({digest})"}, ensure_ascii=False).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/analyze"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# -----------------------------------------------------------------------------
+# 분석 큐
+# -----------------------------------------------------------------------------
+class FailureTriage:
+    def __init__(self, model, concurrency=4, rate=1.0, burst=2, cache_path=None):
+        self.model = model
+        self.cache_path = cache_path
+        self.stats = {"submitted": 0, "cache_hits": 0, "api_calls": 0, "errors": 0}
+        self._bucket = TokenBucket(rate, burst)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="triage")
+        self._cache = self._load_cache()
+        self._inflight = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _load_cache(self):
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                log.warning("⚠️ 분석 캐시 파일을 읽지 못해 새로 시작합니다.")
+        return {}
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f, ensure_ascii=False, indent=1)
+
+    def submit(self, result_key, error_message, png_bytes=None, screenshot_path=None):
+        # result_key: 결과 한 건의 식별자 - (케이스 번호, 기기) (기기 매트릭스에서 같은 케이스가 기기별로 실패해도 따로)
+        future = self._executor.submit(self._analyze, error_message, png_bytes, screenshot_path)
+        with self._lock:
+            self.stats["submitted"] += 1
+            self._futures[result_key] = future
+        return future
+
+    def _analyze(self, error_message, png_bytes, screenshot_path):
+        if png_bytes is None and screenshot_path and os.path.exists(screenshot_path):
+            with open(screenshot_path, "rb") as f:
+                png_bytes = f.read()
+        key = triage_key(png_bytes, error_message)
+
+        with self._lock:
+            if key in self._cache:
+                self.stats["cache_hits"] += 1
+                return self._cache[key]
+            pending = self._inflight.get(key)
+            if pending is None:
+                # 같은 키를 처음 맡은 스레드만 API 호출, 나머지는 결과를 기다린다
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                self.stats["cache_hits"] += 1
+                owner = False
+        if not owner:
+            return pending.result()
+
+        try:
+            self._bucket.acquire()
+            verdict = self.model.analyze(png_bytes, error_message)
+            with self._lock:
+                self.stats["api_calls"] += 1
+                self._cache[key] = verdict
+            pending.set_result(verdict)
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+            verdict = f"분석 실패: {e}"
+            pending.set_result(verdict)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return verdict
+
+    def wait(self):
+        # 모든 분석을 기다린 뒤 {result_key: 판정} 반환
+        self._executor.shutdown(wait=True)
+        self._save_cache()
+        return {result_key: future.result() for result_key, future in self._futures.items()}
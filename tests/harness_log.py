@@ -0,0 +1,212 @@
+from contextlib import contextmanager
+from datetime import datetime
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+from process_local import ProcessLocal
+
+# -----------------------------------------------------------------------------
+# 실행 로그 (레벨 + 케이스 문맥 + 백그라운드 출력)
+# -----------------------------------------------------------------------------
+# 테스트 스레드는 로그 레코드를 큐에 넣기만 하고, 메시지 조립/콘솔·파일 쓰기는 QueueListener 스레드가 한다.
+#  - 레벨: 동작 단위 진행 상황은 INFO, ⚠️는 WARNING, ❌는 ERROR
+#  - 케이스 문맥: with log_context(case="2", device="pixel-7") 안에서 남긴 로그에 case/device가 붙는다
+#    (텍스트 모드에서는 "[#2@pixel-7]" 접두어, JSON 모드에서는 필드)
+#    contextvars 기반이라 스레드마다, asyncio 태스크마다 따로 유지된다 (async_webdriver.py 세션 여러 개를 한 루프에서)
+#  - 형식: text(기존 출력 모양 그대로) / json(한 줄 = 레코드 하나, 기계 처리용)
+#  - quiet: 케이스 안에서 남긴 WARNING 미만 로그는 콘솔에서 뺀다 (요약/경고/실패는 그대로, 파일에는 전부)
+#
+# configure()를 부르지 않은 스크립트(브로커, 벤치마크 등)는 처음 로그를 남길 때 기본값(text/INFO)으로 켜진다.
+# 프로세스 풀 워커는 환경 변수로 같은 설정을 이어받고, fork 직후에는 출력 스레드를 새로 띄운다 (process_local.py).
+
+LOG_FORMAT_ENV = "DAUM_LOG_FORMAT"
+LOG_LEVEL_ENV = "DAUM_LOG_LEVEL"
+LOG_QUIET_ENV = "DAUM_LOG_QUIET"
+LOG_FILE_ENV = "DAUM_LOG_FILE"
+
+ROOT_LOGGER = "daum"
+LOG_FORMATS = ("text", "json")
+
+_context = contextvars.ContextVar("daum_log_context", default={})
+
+
+@contextmanager
+def log_context(**fields):
+    # 중첩 가능 (바깥 device + 안쪽 case). 값이 None인 필드는 무시
+    token = _context.set({**_context.get(), **{k: v for k, v in fields.items() if v is not None}})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def current_context():
+    return _context.get()
+
+
+class _ContextFilter(logging.Filter):
+    # 로그를 남긴 스레드/태스크에서 실행 (큐에 넣기 전에 문맥을 레코드에 옮겨 둔다)
+    def filter(self, record):
+        fields = current_context()
+        record.case = fields.get("case")
+        record.device = fields.get("device")
+        return True
+
+
+class _QuietFilter(logging.Filter):
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or getattr(record, "case", None) is None
+
+
+def _prefix(record):
+    case, device = getattr(record, "case", None), getattr(record, "device", None)
+    if case and device:
+        return f"[#{case}@{device}] "
+    if case:
+        return f"[#{case}] "
+    if device:
+        return f"[{device}] "
+    return ""
+
+
+class TextFormatter(logging.Formatter):
+    # 콘솔: 기존 print 출력 그대로 + 케이스 접두어 (여러 줄 리포트는 접두어 없이)
+    def format(self, record):
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{self.formatException(record.exc_info)}"
+        prefix = _prefix(record)
+        if prefix and not message.startswith("\n"):
+            message = prefix + message
+        return message
+
+
+class FileFormatter(TextFormatter):
+    def format(self, record):
+        stamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        message = super().format(record).lstrip("\n")
+        return f"{stamp} {record.levelname:<7} {record.threadName:<16} {message}"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage().strip("\n"),
+            "case": getattr(record, "case", None),
+            "device": getattr(record, "device", None),
+            "thread": record.threadName,
+            "pid": record.process,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    # 기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 조립한다 → 같은 프로세스 안 큐이므로 레코드를 그대로 넘긴다
+    def prepare(self, record):
+        return record
+
+
+class _LogSetup:
+    def __init__(self, log_format, level, quiet, log_file):
+        self.log_format = log_format
+        self.level = level
+        self.quiet = quiet
+        self.log_file = log_file
+        self.listener = None
+        self.handler = None
+
+    def start(self):
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(JsonFormatter() if self.log_format == "json" else TextFormatter())
+        if self.quiet:
+            console.addFilter(_QuietFilter())
+        handlers = [console]
+        if self.log_file:
+            os.makedirs(os.path.dirname(os.path.abspath(self.log_file)), exist_ok=True)
+            file_handler = logging.FileHandler(self.log_file, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter() if self.log_format == "json" else FileFormatter())
+            handlers.append(file_handler)
+
+        log_queue = queue.SimpleQueue()
+        self.handler = _DeferredQueueHandler(log_queue)
+        self.handler.addFilter(_ContextFilter())
+        self.listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        root = logging.getLogger(ROOT_LOGGER)
+        root.handlers = [self.handler]
+        root.setLevel(self.level)
+        root.propagate = False
+        self.listener.start()
+
+    def stop(self):
+        # 큐에 남은 로그를 모두 출력하고 스레드 종료
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+
+_setup = ProcessLocal({"log_format": LOG_FORMAT_ENV, "level": LOG_LEVEL_ENV, "quiet": LOG_QUIET_ENV,
+                       "log_file": LOG_FILE_ENV}, exitpriority=20)
+
+
+def configure(log_format="text", level="INFO", quiet=False, log_file=None):
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"지원하지 않는 로그 형식: {log_format}")
+    setup = _LogSetup(log_format, level.upper(), quiet, os.path.abspath(log_file) if log_file else None)
+    setup.start()
+    previous = _setup.configure(setup, log_format=log_format, level=setup.level, quiet="1" if quiet else "",
+                                log_file=setup.log_file)
+    if previous is not None:
+        previous.stop()
+    return setup
+
+
+def _setup_from_env(env):
+    setup = _LogSetup(env["log_format"] or "text", env["level"] or "INFO", bool(env["quiet"]), env["log_file"])
+    setup.start()
+    return setup
+
+
+def _ensure_setup():
+    # 워커 종료 시에는 떼어 내고 멈춘다 (그 뒤의 로그는 다시 켜서 출력)
+    _setup.get(_setup_from_env, lambda setup: close_logging())
+
+
+class _LazyLogger(logging.LoggerAdapter):
+    # 모듈 import 시점에 만들어 두고, 처음 로그를 남길 때 출력 스레드를 띄운다
+    def __init__(self, name):
+        super().__init__(logging.getLogger(f"{ROOT_LOGGER}.{name}"), {})
+
+    def log(self, level, msg, *args, **kwargs):
+        _ensure_setup()
+        super().log(level, msg, *args, **kwargs)
+
+    def process(self, msg, kwargs):
+        return msg, kwargs
+
+
+def get_logger(name):
+    return _LazyLogger(name)
+
+
+def close_logging():
+    # 설정 환경 변수는 남겨 둔다 (닫은 뒤에 남기는 로그도 같은 설정으로 다시 켜지도록)
+    setup = _setup.detach(clear_env=False)
+    if setup is not None:
+        setup.stop()
+    return setup
+
+
+atexit.register(close_logging)
@@ -0,0 +1,89 @@
+from datetime import datetime
+import argparse
+import json
+import os
+import statistics
+import shutil
+import tempfile
+import time
+
+from chrome_options import LAUNCH_PROFILES, build_chrome_options
+from driver_pool import start_chrome
+
+# -----------------------------------------------------------------------------
+# 실행 프로필 비교 벤치마크 (브라우저 기동 시간 / 첫 화면 표시 시간)
+# -----------------------------------------------------------------------------
+# 사용 예:  python tests/launch_benchmark.py --runs 5 --url https://m.daum.net
+# 프로필마다 runs회씩 새 브라우저를 띄워 아래 값을 측정하고 중앙값을 비교한다.
+#  - startup : webdriver.Chrome() 생성 ~ 창 크기 설정 완료
+#  - load    : driver.get() 호출 ~ 반환 (document load)
+#  - fcp     : 페이지 기준 first-contentful-paint (Paint Timing API)
+
+PAINT_SCRIPT = """
+const fcp = performance.getEntriesByName('first-contentful-paint')[0];
+return fcp ? fcp.startTime : null;
+"""
+
+
+def measure_once(profile, url):
+    profile_dir = tempfile.mkdtemp(prefix="chrome_bench_")
+    started = time.perf_counter()
+    driver = start_chrome(build_chrome_options(profile_dir, profile=profile))
+    try:
+        startup = time.perf_counter() - started
+        started = time.perf_counter()
+        driver.get(url)
+        load = time.perf_counter() - started
+        fcp_ms = driver.execute_script(PAINT_SCRIPT)
+        return {"startup": startup, "load": load, "fcp": fcp_ms / 1000 if fcp_ms is not None else None}
+    finally:
+        driver.quit()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+def median(values):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def run_benchmark(profiles, url, runs):
+    summary = {}
+    for profile in profiles:
+        samples = [measure_once(profile, url) for _ in range(runs)]
+        summary[profile] = {metric: median(s[metric] for s in samples) for metric in ("startup", "load", "fcp")}
+        print(f"⏱️ {profile}: " + ", ".join(
+            f"{metric} {value:.3f}s" if value is not None else f"{metric} -"
+            for metric, value in summary[profile].items()))
+    return summary
+
+
+def print_comparison(summary, baseline="default"):
+    if baseline not in summary:
+        return
+    base = summary[baseline]
+    for profile, metrics in summary.items():
+        if profile == baseline:
+            continue
+        saved = [
+            f"{metric} {base[metric] - value:+.3f}s"
+            for metric, value in metrics.items()
+            if value is not None and base[metric] is not None
+        ]
+        print(f"📉 {profile} 절약 (케이스당, {baseline} 대비): {', '.join(saved)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chrome 실행 프로필 기동/첫 화면 벤치마크")
+    parser.add_argument("--profiles", nargs="+", choices=LAUNCH_PROFILES, default=list(LAUNCH_PROFILES))
+    parser.add_argument("--url", default="https://m.daum.net")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    summary = run_benchmark(args.profiles, args.url, args.runs)
+    print_comparison(summary)
+
+    out_path = os.path.join(os.getcwd(), "logs", f"launch_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"url": args.url, "runs": args.runs, "profiles": summary}, f, indent=2)
+    print(f"🧾 결과 저장: {out_path}")
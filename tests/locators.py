@@ -0,0 +1,189 @@
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+import threading
+
+# -----------------------------------------------------------------------------
+# 이름 붙은 로케이터 레지스트리 + 페이지 로드 단위 요소 캐시
+# -----------------------------------------------------------------------------
+# - 로케이터는 이름으로 한 곳에 정의하고, 전략은 빠른 순서(ID → CSS → XPath)로 시도한다.
+#   처음 찾은 전략을 기억해 두었다가 다음부터는 그 전략부터 쓴다 (없는 전략을 매번 먼저 시도하지 않음).
+# - 찾은 WebElement는 드라이버별로 "페이지 세대"와 함께 캐시한다.
+#   이동 명령(get/back/forward/refresh), 클릭, 엔터 입력, 창/프레임 전환이 일어나면 세대가 바뀌어 캐시가 비워진다.
+#   스크립트로 페이지를 바꾸는 경우는 invalidate(driver)를 직접 호출한다.
+# - 캐시 적중/미스/stale 횟수는 케이스마다 take_stats()로 가져가 결과 metrics(loc.*)에 남긴다.
+
+# 페이지(또는 요소 핸들)가 바뀔 수 있는 WebDriver 명령
+NAVIGATION_COMMANDS = {
+    "get", "goBack", "goForward", "refresh", "clickElement",
+    "switchToWindow", "switchToFrame", "switchToParentFrame", "newWindow", "close",
+}
+SUBMIT_KEYS = (Keys.RETURN, Keys.ENTER)
+
+STRATEGY_ORDER = (By.ID, By.CSS_SELECTOR, By.XPATH)
+
+
+class Locator:
+    def __init__(self, name, id=None, css=None, xpath=None):
+        self.name = name
+        candidates = {By.ID: id, By.CSS_SELECTOR: css, By.XPATH: xpath}
+        self.strategies = [(by, candidates[by]) for by in STRATEGY_ORDER if candidates[by]]
+        if not self.strategies:
+            raise ValueError(f"로케이터 {name}: 전략이 하나도 없습니다.")
+        self._resolved = None
+        self._lock = threading.Lock()
+
+    def candidates(self):
+        # 이전에 찾은 전략을 먼저, 나머지는 빠른 순서대로 (페이지 구조가 바뀌어도 다른 전략으로 찾을 수 있게)
+        if self._resolved is None:
+            return self.strategies
+        return [self._resolved] + [s for s in self.strategies if s != self._resolved]
+
+    def remember(self, strategy):
+        with self._lock:
+            self._resolved = strategy
+
+    def __repr__(self):
+        return f"Locator({self.name!r}, {self.strategies})"
+
+
+# --- 스크립트에서 쓰는 로케이터 (같은 요소를 가리키던 XPath 여러 개를 하나로) ---
+LOCATORS = {
+    "body": Locator("body", css="body"),
+    "search_input": Locator(
+        "search_input",
+        css='input[name="q"], input#q, input[type="search"]',
+        xpath='//input[@name="q" or @id="q" or @type="search"]',
+    ),
+}
+
+
+def css(name):
+    # 페이지 안 스크립트(assertions.py)에서 쓸 CSS 선택자
+    return next(value for by, value in LOCATORS[name].strategies if by == By.CSS_SELECTOR)
+
+
+def register(locator):
+    LOCATORS[locator.name] = locator
+    return locator
+
+
+class LocatorCache:
+    def __init__(self):
+        self.generation = 0
+        self.elements = {}
+        self.stats = {"hits": 0, "misses": 0, "stale": 0}
+
+    def invalidate(self):
+        self.generation += 1
+        self.elements.clear()
+
+    def take_stats(self):
+        stats, self.stats = self.stats, {"hits": 0, "misses": 0, "stale": 0}
+        return stats
+
+
+def _attach_cache(driver):
+    cache = LocatorCache()
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        result = original(driver_command, params)
+        if driver_command in NAVIGATION_COMMANDS or (
+                driver_command == "sendKeysToElement" and any(k in (params or {}).get("text", "") for k in SUBMIT_KEYS)):
+            cache.invalidate()
+        return result
+
+    driver.execute = execute
+    driver.locator_cache = cache
+    return cache
+
+
+def cache_for(driver):
+    cache = getattr(driver, "locator_cache", None)
+    return cache if cache is not None else _attach_cache(driver)
+
+
+def invalidate(driver):
+    cache_for(driver).invalidate()
+
+
+def take_stats(driver):
+    cache = getattr(driver, "locator_cache", None)
+    return cache.take_stats() if cache is not None else None
+
+
+def _resolve(driver, locator):
+    last_error = None
+    for strategy in locator.candidates():
+        try:
+            element = driver.find_element(*strategy)
+        except NoSuchElementException as e:
+            last_error = e
+            continue
+        locator.remember(strategy)
+        return element
+    raise last_error
+
+
+def find(driver, name):
+    # 같은 페이지 세대 안에서는 캐시된 요소 핸들을 그대로 돌려준다
+    locator = LOCATORS[name]
+    cache = cache_for(driver)
+    element = cache.elements.get(name)
+    if element is not None:
+        cache.stats["hits"] += 1
+        return element
+    cache.stats["misses"] += 1
+    generation = cache.generation
+    element = _resolve(driver, locator)
+    if cache.generation == generation:
+        cache.elements[name] = element
+    return element
+
+
+def _with_stale_retry(driver, name, check):
+    # 캐시된 핸들이 DOM에서 사라졌으면 그 항목만 버리고 한 번 다시 찾는다
+    try:
+        return check(find(driver, name))
+    except StaleElementReferenceException:
+        cache = cache_for(driver)
+        cache.stats["stale"] += 1
+        cache.elements.pop(name, None)
+        return check(find(driver, name))
+
+
+# --- ProfiledWait.until 에 넘기는 조건 (expected_conditions 대체) ---
+def present(name):
+    def present_element(driver):
+        try:
+            return _with_stale_retry(driver, name, lambda element: element)
+        except NoSuchElementException:
+            return False
+    return present_element
+
+
+def visible(name):
+    def visible_element(driver):
+        try:
+            return _with_stale_retry(driver, name, lambda element: element if element.is_displayed() else False)
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+    return visible_element
+
+
+def clickable(name):
+    def clickable_element(driver):
+        try:
+            return _with_stale_retry(
+                driver, name, lambda element: element if element.is_displayed() and element.is_enabled() else False)
+        except (NoSuchElementException, StaleElementReferenceException):
+            return False
+    return clickable_element
+
+
+def format_locator_report(totals):
+    lookups = totals["hits"] + totals["misses"]
+    rate = totals["hits"] / lookups * 100 if lookups else 0.0
+    return f"조회 {lookups}회 / 캐시 적중 {totals['hits']}회 ({rate:.0f}%) / 미스 {totals['misses']}회 / stale {totals['stale']}회"
@@ -0,0 +1,78 @@
+import argparse
+import glob
+import os
+from datetime import datetime
+
+from gsheet_sink import FakeGspreadClient
+from results import JsonlResultWriter, read_jsonl
+from timing_db import TimingDB
+import daum_search_v8 as suite
+
+# -----------------------------------------------------------------------------
+# 샤드 결과 병합: 러너별 JSONL → 하나의 JSONL + 구글 시트 1회 저장
+# -----------------------------------------------------------------------------
+# 사용 예:  python tests/merge_shards.py "shard-results/*.jsonl" --out logs/results_merged.jsonl
+# --timing-db 를 주면 전체 케이스의 소요 시간을 이력 DB에 쌓는다 (CI에서 캐시해 다음 실행의 --shard-strategy timing에 사용)
+
+
+def merge_results(paths):
+    # 케이스 테이블 순서대로 정렬 (테이블에 없는 번호는 뒤로)
+    order = {case.case_id: i for i, case in enumerate(suite.TEST_CASES)}
+    records = [record for path in paths for record in read_jsonl(path)]
+    records.sort(key=lambda r: (order.get(r.number, len(order)), r.number, r.device or "", r.executed_at))
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="샤드별 결과 JSONL 병합 + 구글 시트 저장")
+    parser.add_argument("patterns", nargs="+", help="샤드 결과 JSONL 경로 또는 glob 패턴")
+    parser.add_argument("--out", default=os.path.join("logs", "results_merged.jsonl"), help="병합 JSONL 저장 경로")
+    parser.add_argument("--no-sheets", action="store_true", help="구글 시트 저장 생략")
+    parser.add_argument("--fake-sheets", action="store_true", help="로컬 가짜 클라이언트에 저장 (오프라인 확인용)")
+    parser.add_argument("--timing-db", default=None, help="병합 결과의 소요 시간을 기록할 이력 DB 경로")
+    parser.add_argument("--regression-factor", type=float, default=1.5,
+                        help="이력 중앙값 대비 이 배수를 넘으면 성능 저하로 표시")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.patterns for p in glob.glob(pattern)})
+    if not paths:
+        parser.error("병합할 결과 파일이 없습니다.")
+    records = merge_results(paths)
+    print(f"🧩 샤드 {len(paths)}개 병합: 결과 {len(records)}건")
+
+    if os.path.exists(args.out):
+        os.remove(args.out)
+    writer = JsonlResultWriter(args.out)
+    for record in records:
+        writer.write(record)
+    writer.close()
+    print(f"🧾 병합 결과: {args.out}")
+
+    critical = [r for r in records if not r.quarantined]
+    failed = [r.number for r in critical if r.result == "FAIL"]
+    blocked = [r.number for r in critical if r.result == "BLOCKED"]
+    passed = len(critical) - len(failed) - len(blocked)
+    print(f"✅ PASS {passed}건 / ❌ FAIL {len(failed)}건" + (f" ({', '.join(failed)})" if failed else "")
+          + (f" / ⛔ BLOCKED {len(blocked)}건 ({', '.join(blocked)})" if blocked else ""))
+    quarantined = [f"{r.number}:{r.result}" for r in records if r.quarantined]
+    if quarantined:
+        print(f"🧪 격리 케이스 (집계 제외): {', '.join(quarantined)}")
+
+    if args.timing_db:
+        os.makedirs(os.path.dirname(args.timing_db) or ".", exist_ok=True)
+        timing_db = TimingDB(args.timing_db)
+        try:
+            suite.record_case_timings(timing_db, records, args.regression_factor)
+        finally:
+            timing_db.close()
+        print(f"⏱️ 소요 시간 이력: {args.timing_db}")
+
+    if records and not args.no_sheets:
+        started = min(datetime.strptime(r.executed_at, "%Y-%m-%d %H:%M:%S") for r in records)
+        ended = max(datetime.strptime(r.executed_at, "%Y-%m-%d %H:%M:%S") for r in records)
+        suite.write_results_to_gsheet(
+            records, suite.device_name, suite.device_model,
+            suite.platform_version, "Daum Mobile Web", suite.app_version,
+            started, ended, suite.TESTER_NAME, suite.SCRIPT_NAME,
+            client=FakeGspreadClient() if args.fake_sheets else None
+        )
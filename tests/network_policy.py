@@ -0,0 +1,237 @@
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+import argparse
+import json
+import os
+import threading
+
+# -----------------------------------------------------------------------------
+# 케이스별 네트워크 차단 정책 (Chrome DevTools Protocol)
+# -----------------------------------------------------------------------------
+# Network.setBlockedURLs로 광고/트래커 URL과 리소스 종류(이미지/폰트/미디어)를 막는다.
+# CDP 명령만으로는 요청 가로채기 이벤트를 받을 수 없어서, 리소스 종류는 확장자 패턴으로 차단한다.
+# 절약량은 Chrome 성능 로그(goog:loggingPrefs performance)의 Network 이벤트로 집계한다.
+#  - 차단된 요청 수   : Network.loadingFailed (blockedReason 있음)
+#  - 절약 바이트(추정) : 차단된 URL의 이전 실행 전송 크기 (logs/resource_sizes.json에 학습)
+
+TYPE_PATTERNS = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"),
+    "font": ("*.woff*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"),
+}
+
+AD_TRACKER_PATTERNS = (
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*adfit.kakao.com*",
+    "*display.ad.daum.net*",
+    "*tiara.daum.net*",
+    "*/ads/*",
+)
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    name: str
+    blocked_patterns: Tuple[str, ...] = ()
+    blocked_types: Tuple[str, ...] = ()
+
+    def url_patterns(self):
+        patterns = list(self.blocked_patterns)
+        for resource_type in self.blocked_types:
+            patterns.extend(TYPE_PATTERNS[resource_type])
+        return patterns
+
+    def with_patterns(self, extra):
+        if not extra:
+            return self
+        return ResourcePolicy(self.name, self.blocked_patterns + tuple(extra), self.blocked_types)
+
+
+RESOURCE_POLICIES = {
+    "none": ResourcePolicy("none"),
+    "no-ads": ResourcePolicy("no-ads", AD_TRACKER_PATTERNS),
+    "dom-only": ResourcePolicy("dom-only", AD_TRACKER_PATTERNS, ("image", "font", "media")),
+}
+
+
+def apply_resource_policy(driver, policy):
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": policy.url_patterns()})
+
+
+# -----------------------------------------------------------------------------
+# 성능 로그 기반 네트워크 집계
+# -----------------------------------------------------------------------------
+class ResourceSizeCache:
+    # URL → 마지막으로 관측된 전송 크기 (차단 시 절약량 추정용)
+    def __init__(self, path=None):
+        self.path = path
+        self.sizes = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.sizes = json.load(f)
+            except (OSError, ValueError):
+                self.sizes = {}
+
+    def learn(self, url, size):
+        with self._lock:
+            self.sizes[url] = size
+
+    def get(self, url):
+        return self.sizes.get(url)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.sizes, f)
+
+
+def read_network_events(driver):
+    # 마지막 호출 이후 쌓인 성능 로그의 Network 이벤트 (method, params) 목록 (로그는 읽으면 비워진다)
+    events = []
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message.get("method", "").startswith("Network."):
+            events.append((message["method"], message.get("params", {})))
+    return events
+
+
+def collect_network_stats(driver, size_cache=None):
+    # 요청/전송량/차단 현황 집계
+    urls = {}
+    stats = {"requests": 0, "transfer_bytes": 0, "blocked_requests": 0, "saved_bytes": 0, "unknown_saved": 0}
+    for method, params in read_network_events(driver):
+        if method == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+            stats["requests"] += 1
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength", 0))
+            stats["transfer_bytes"] += size
+            url = urls.get(params["requestId"])
+            if size_cache is not None and url:
+                size_cache.learn(url, size)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            stats["blocked_requests"] += 1
+            known = size_cache.get(urls.get(params["requestId"])) if size_cache is not None else None
+            if known is None:
+                stats["unknown_saved"] += 1
+            else:
+                stats["saved_bytes"] += known
+    return stats
+
+
+def format_network_report(rows):
+    # rows: (케이스 번호, 정책 이름, stats)
+    lines = [f"{'케이스':>6} {'정책':>9} {'요청':>5} {'전송(KB)':>9} {'차단':>5} {'절약(KB)':>9}"]
+    for case_id, policy_name, stats in rows:
+        saved = f"{stats['saved_bytes'] / 1024:>9.1f}" + ("+" if stats["unknown_saved"] else "")
+        lines.append(f"{case_id:>6} {policy_name:>9} {stats['requests']:>5} "
+                     f"{stats['transfer_bytes'] / 1024:>9.1f} {stats['blocked_requests']:>5} {saved}")
+    return "\n".join(lines)
+
+
+# -----------------------------------------------------------------------------
+# 로컬 HTTP 픽스처 사이트 (정책 동작/절약량 확인용)
+# -----------------------------------------------------------------------------
+# 페이지 1개 + 이미지/폰트/광고 스크립트를 알려진 크기로 제공하고, 서버가 실제로 보낸 요청/바이트를 센다.
+class FixtureSite:
+    ASSETS = {
+        "/img/banner.png": ("image/png", 40_000),
+        "/img/thumb.jpg": ("image/jpeg", 25_000),
+        "/fonts/body.woff2": ("font/woff2", 30_000),
+        "/ads/ad.js": ("application/javascript", 15_000),
+    }
+    PAGE = """<!doctype html><html><head><meta charset="utf-8">
+<style>@font-face { font-family: body; src: url(/fonts/body.woff2); } body { font-family: body; }</style>
+<script src="/ads/ad.js"></script></head>
+<body><form action="/search"><input name="q" id="q" type="search"></form>
+<img src="/img/banner.png"><img src="/img/thumb.jpg"><p>fixture</p></body></html>"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.served = {"requests": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path in site.ASSETS:
+                    content_type, size = site.ASSETS[path]
+                    body = (b"/*" + b"x" * (size - 4) + b"*/") if content_type.endswith("javascript") else b"\0" * size
+                else:
+                    content_type, body = "text/html; charset=utf-8", site.PAGE.encode()
+                with site._lock:
+                    site.served["requests"] += 1
+                    site.served["bytes"] += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def reset_counters(self):
+        with self._lock:
+            self.served = {"requests": 0, "bytes": 0}
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# --- 픽스처 사이트로 정책별 실제 절약량(서버 기준)과 로그 집계값을 비교 ---
+def run_fixture_check(policy_names):
+    from chrome_options import build_chrome_options
+    from driver_pool import start_chrome
+
+    site = FixtureSite().start()
+    driver = start_chrome(build_chrome_options(network_log=True))
+    size_cache = ResourceSizeCache()
+    try:
+        served = {}
+        for name in policy_names:
+            apply_resource_policy(driver, RESOURCE_POLICIES[name])
+            collect_network_stats(driver, size_cache)
+            site.reset_counters()
+            driver.get(site.url)
+            stats = collect_network_stats(driver, size_cache)
+            served[name] = dict(site.served)
+            print(f"🧪 {name}: 서버 응답 {served[name]['requests']}건 / {served[name]['bytes']:,}B, "
+                  f"로그 집계 요청 {stats['requests']}건 / 차단 {stats['blocked_requests']}건 / 절약 추정 {stats['saved_bytes']:,}B")
+        if "none" in served:
+            for name, counters in served.items():
+                if name != "none":
+                    print(f"📉 {name}: 실제 절약 {served['none']['requests'] - counters['requests']}건 / "
+                          f"{served['none']['bytes'] - counters['bytes']:,}B")
+    finally:
+        driver.quit()
+        site.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="네트워크 차단 정책을 로컬 픽스처 사이트로 확인")
+    parser.add_argument("--policies", nargs="+", choices=list(RESOURCE_POLICIES), default=["none", "no-ads", "dom-only"])
+    args = parser.parse_args()
+    run_fixture_check(args.policies)
@@ -0,0 +1,163 @@
+import threading
+
+# -----------------------------------------------------------------------------
+# 케이스별 페이지 성능 지표 (Chrome DevTools Protocol)
+# -----------------------------------------------------------------------------
+# 케이스가 끝난 시점의 문서(마지막 이동 결과)에 대해 CDP 명령 2번으로 수집한다.
+#  - Performance.getMetrics : JS 힙, DOM 노드 수, 스크립트/레이아웃/태스크 누적 시간
+#  - Runtime.evaluate       : Navigation Timing(TTFB/DCL/load), paint(FCP), LCP/CLS(buffered 관찰자),
+#                             Resource Timing(요청 수/전송량/캐시 적중)
+# 결과는 "perf." 접두어 측정값으로 결과 레코드에 붙고, 콘솔 리포트와 시트 열로 나간다.
+# 전송량은 Resource Timing 기준이라 Timing-Allow-Origin 없는 외부 리소스는 0으로 잡힌다
+# (정확한 바이트는 네트워크 정책의 net.transfer_bytes 쪽).
+#
+# enable_page_metrics()는 이동 전에 세션마다 한 번: Performance 도메인을 켜고,
+# 새 문서마다 Resource Timing 버퍼를 늘리는 스크립트를 등록한다 (기본 250건이면 광고 많은 페이지에서 잘림).
+
+RESOURCE_BUFFER_SIZE = 1000
+
+INIT_SCRIPT = f"performance.setResourceTimingBufferSize({RESOURCE_BUFFER_SIZE});"
+
+# buffered 관찰자 + takeRecords(): 페이지 시작부터 쌓인 LCP/레이아웃 이동 항목을 동기로 꺼낸다
+PAGE_TIMING_EXPRESSION = """(() => {
+  const observed = (type) => {
+    try {
+      const observer = new PerformanceObserver(() => {});
+      observer.observe({type, buffered: true});
+      const entries = observer.takeRecords();
+      observer.disconnect();
+      return entries;
+    } catch (e) {
+      return [];
+    }
+  };
+  const nav = performance.getEntriesByType("navigation")[0];
+  const fcp = performance.getEntriesByName("first-contentful-paint")[0];
+  const lcp = observed("largest-contentful-paint").pop();
+  const shifts = observed("layout-shift").filter(e => !e.hadRecentInput);
+  const resources = performance.getEntriesByType("resource");
+  let transfer = 0, cached = 0;
+  for (const r of resources) {
+    transfer += r.transferSize || 0;
+    if (r.transferSize === 0 && r.decodedBodySize > 0) cached++;
+  }
+  return {
+    url: location.href,
+    ttfb: nav ? nav.responseStart : null,
+    dcl: nav ? nav.domContentLoadedEventEnd : null,
+    load: nav && nav.loadEventEnd > 0 ? nav.loadEventEnd : null,
+    nav_transfer: nav ? nav.transferSize : 0,
+    fcp: fcp ? fcp.startTime : null,
+    lcp: lcp ? lcp.startTime : null,
+    cls: shifts.reduce((sum, e) => sum + e.value, 0),
+    resources: resources.length,
+    transfer: transfer,
+    cached: cached,
+  };
+})()"""
+
+# Performance.getMetrics 이름 → (측정값 키, 변환)
+CDP_METRICS = {
+    "JSHeapUsedSize": ("js_heap_mb", lambda v: round(v / 1024 / 1024, 2)),
+    "Nodes": ("dom_nodes", int),
+    "ScriptDuration": ("script_ms", lambda v: round(v * 1000, 1)),
+    "LayoutDuration": ("layout_ms", lambda v: round(v * 1000, 1)),
+    "TaskDuration": ("task_ms", lambda v: round(v * 1000, 1)),
+}
+
+# 리포트/시트 열: (측정값 키, 열 이름)
+PERF_COLUMNS = (
+    ("perf.ttfb_ms", "TTFB(ms)"),
+    ("perf.dcl_ms", "DCL(ms)"),
+    ("perf.load_ms", "Load(ms)"),
+    ("perf.fcp_ms", "FCP(ms)"),
+    ("perf.lcp_ms", "LCP(ms)"),
+    ("perf.cls", "CLS"),
+    ("perf.js_heap_mb", "JS 힙(MB)"),
+    ("perf.dom_nodes", "DOM 노드"),
+    ("perf.requests", "요청"),
+    ("perf.transfer_kb", "전송(KB)"),
+)
+
+_enabled = set()
+_enabled_lock = threading.Lock()
+
+
+def _ms(value):
+    return round(value, 1) if value is not None else None
+
+
+def page_metrics(cdp_metrics, timing):
+    # cdp_metrics: Performance.getMetrics 의 metrics 목록 / timing: PAGE_TIMING_EXPRESSION 결과
+    metrics = {"perf.url": timing.get("url")}
+    for item in cdp_metrics:
+        if item["name"] in CDP_METRICS:
+            key, convert = CDP_METRICS[item["name"]]
+            metrics[f"perf.{key}"] = convert(item["value"])
+    metrics.update({
+        "perf.ttfb_ms": _ms(timing.get("ttfb")),
+        "perf.dcl_ms": _ms(timing.get("dcl")),
+        "perf.load_ms": _ms(timing.get("load")),
+        "perf.fcp_ms": _ms(timing.get("fcp")),
+        "perf.lcp_ms": _ms(timing.get("lcp")),
+        "perf.cls": round(timing.get("cls") or 0, 4),
+        "perf.requests": timing.get("resources", 0) + 1,  # 문서 자신 포함
+        "perf.transfer_kb": round(((timing.get("nav_transfer") or 0) + (timing.get("transfer") or 0)) / 1024, 1),
+        "perf.cached_requests": timing.get("cached", 0),
+    })
+    return metrics
+
+
+def _evaluate_args():
+    return {"expression": PAGE_TIMING_EXPRESSION, "returnByValue": True}
+
+
+def _evaluated(response):
+    result = response.get("result", {})
+    if response.get("exceptionDetails"):
+        raise RuntimeError(f"성능 지표 스크립트 오류: {response['exceptionDetails'].get('text')}")
+    return result.get("value") or {}
+
+
+def enable_page_metrics(driver):
+    # 세션마다 한 번 (브로커에서 다시 빌린 세션은 이미 켜져 있음)
+    with _enabled_lock:
+        if driver.session_id in _enabled:
+            return
+        _enabled.add(driver.session_id)
+    driver.execute_cdp_cmd("Performance.enable", {})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INIT_SCRIPT})
+
+
+def collect_page_metrics(driver):
+    cdp_metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    timing = _evaluated(driver.execute_cdp_cmd("Runtime.evaluate", _evaluate_args()))
+    return page_metrics(cdp_metrics, timing)
+
+
+# --- async_webdriver.AsyncSession 용 (케이스마다 새 세션이라 켜기 여부는 따로 기억하지 않음) ---
+async def enable_page_metrics_async(session):
+    await session.execute_cdp_cmd("Performance.enable", {})
+    await session.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": INIT_SCRIPT})
+
+
+async def collect_page_metrics_async(session):
+    cdp_metrics = (await session.execute_cdp_cmd("Performance.getMetrics", {}))["metrics"]
+    timing = _evaluated(await session.execute_cdp_cmd("Runtime.evaluate", _evaluate_args()))
+    return page_metrics(cdp_metrics, timing)
+
+
+def format_perf_report(rows):
+    # rows: (케이스 번호, 기기, metrics)
+    header = f"{'케이스':>6} {'기기':>16} " + " ".join(f"{title:>9}" for _, title in PERF_COLUMNS) + "  URL"
+    lines = [header]
+    for case_id, device, m in rows:
+        cells = " ".join(f"{'-' if m.get(key) is None else m[key]:>9}" for key, _ in PERF_COLUMNS)
+        lines.append(f"{case_id:>6} {device:>16} {cells}  {m.get('perf.url') or '-'}")
+    return "\n".join(lines)
+
+
+def sheet_values(metrics):
+    # 시트 행에 덧붙일 값 (PERF_COLUMNS 순서, 없는 값은 빈 칸)
+    metrics = metrics or {}
+    return ["" if metrics.get(key) is None else metrics[key] for key, _ in PERF_COLUMNS]
@@ -0,0 +1,75 @@
+import multiprocessing.util
+import os
+import threading
+
+# -----------------------------------------------------------------------------
+# 프로세스마다 하나씩 두는 공유 객체 (로그 출력 / 트레이서 / 산출물 저장소 / 결과 JSONL / 스크린샷 저장기)
+# -----------------------------------------------------------------------------
+# 메인 프로세스는 configure()로 객체를 만들고 설정을 DAUM_* 환경 변수로 남긴다.
+# 프로세스 풀 워커는 처음 get()할 때 그 환경 변수로 같은 설정의 객체를 새로 만들고,
+# 워커가 끝날 때 multiprocessing.util.Finalize로 정리한다 (워커 종료 경로에서는 atexit가 돌지 않음).
+# fork 직후 자식은 부모의 객체를 쓰지 않는다 - 출력 스레드/파일 버퍼는 자식으로 넘어오지 않으므로 새로 만든다.
+#
+#   _tracer = ProcessLocal({"path": TRACE_PATH_ENV, "trace_id": TRACE_ID_ENV})
+#   _tracer.configure(tracer, path=tracer.path, trace_id=tracer.trace_id)       # 메인
+#   _tracer.get(lambda env: Tracer(**env) if env["path"] else None, Tracer.close)  # 어디서나
+
+
+class ProcessLocal:
+    def __init__(self, env=None, exitpriority=30):
+        # env: 설정 이름 → 환경 변수 이름 (워커로 넘길 설정이 없으면 생략)
+        self.env = dict(env or {})
+        self.exitpriority = exitpriority
+        self._value = None
+        self._lock = threading.Lock()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    @property
+    def value(self):
+        return self._value
+
+    def settings(self):
+        # 환경 변수에 남은 설정 (없는 값은 None)
+        return {name: os.environ.get(env_name) or None for name, env_name in self.env.items()}
+
+    def configure(self, value, **settings):
+        # 이 프로세스의 객체를 바꾸고 설정을 환경 변수로 남긴다. 이전 객체를 돌려준다 (정리는 호출한 쪽에서)
+        with self._lock:
+            previous, self._value = self._value, value
+            for name, env_name in self.env.items():
+                os.environ[env_name] = settings.get(name) or ""
+        return previous
+
+    def get(self, create=None, finalize=None, reuse=None):
+        # 객체가 없으면(또는 reuse(객체)가 False면) create(환경 변수 설정)로 새로 만든다.
+        # finalize를 주면 새로 만든 객체는 이 프로세스가 끝날 때 finalize(객체)로 정리
+        value = self._value
+        if value is not None and (reuse is None or reuse(value)):
+            return value
+        if create is None:
+            return value
+        with self._lock:
+            previous = self._value
+            if previous is not None and (reuse is None or reuse(previous)):
+                return previous
+            if previous is not None and finalize:
+                finalize(previous)
+            value = create(self.settings())
+            if value is not None and finalize:
+                multiprocessing.util.Finalize(None, finalize, args=(value,), exitpriority=self.exitpriority)
+            self._value = value
+            return value
+
+    def detach(self, clear_env=True):
+        # 이 프로세스의 객체를 떼어 돌려준다 (정리는 호출한 쪽에서). clear_env면 워커로 넘기던 설정도 지운다
+        with self._lock:
+            value, self._value = self._value, None
+            if clear_env:
+                for env_name in self.env.values():
+                    os.environ.pop(env_name, None)
+        return value
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._value = None
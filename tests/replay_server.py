@@ -0,0 +1,261 @@
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+import argparse
+import base64
+import json
+import os
+import re
+import threading
+import time
+
+from harness_log import get_logger
+from network_policy import read_network_events
+
+# -----------------------------------------------------------------------------
+# 다음 모바일 페이지 녹화/재생 (오프라인 벤치마크용 로컬 HTTP 서버)
+# -----------------------------------------------------------------------------
+# 녹화: 실제 사이트로 케이스를 돌리면서 CDP(Network.getResponseBody)로 응답을 모아 HAR 형식 JSON으로 저장
+#       python tests/daum_search_v8.py --record tests/fixtures/daum_mobile.har.json
+# 재생: 저장된 응답을 로컬 스레드 HTTP 서버로 제공 (지연/대역폭 조절 가능)
+#       python tests/daum_search_v8.py --replay tests/fixtures/daum_mobile.har.json --replay-latency-ms 40
+#
+# 재생 서버 주소 체계: http://127.0.0.1:<port>/<원래 호스트>/<원래 경로>
+# 텍스트 응답(HTML/CSS/JS/JSON) 안의 녹화된 호스트 절대 URL은 위 주소로 바꿔서 내려준다.
+# 호스트 없이 들어온 루트 상대 경로(/search?...)는 Referer의 호스트로 찾는다.
+# 재생 중인 Chrome은 host_resolver_rules로 모든 호스트 이름을 이 서버로 해석한다 - 바꿔 쓰지 못한 URL
+# (스크립트가 만든 주소, 녹화 안 된 광고/트래커 호스트)도 실제 네트워크로 나가지 않고 여기서 404 (https는 연결 실패).
+# 이때 원래 호스트는 Host 헤더로 알 수 있다.
+#
+# 작은 손 작성 스냅샷(tests/fixtures/daum_mobile_sample.har.json)으로 Chrome 없이 재생 경로를 확인할 수 있다.
+
+log = get_logger("replay_server")
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_FIXTURE = os.path.join(FIXTURE_DIR, "daum_mobile.har.json")
+SAMPLE_FIXTURE = os.path.join(FIXTURE_DIR, "daum_mobile_sample.har.json")
+
+TEXT_MIME_HINTS = ("html", "css", "javascript", "json", "xml", "text/plain")
+
+# 재생 시 그대로 내려주면 안 되는 헤더 (본문은 이미 디코딩됨 / 로컬 주소와 충돌하는 보안 헤더)
+DROPPED_HEADERS = {
+    "content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive",
+    "content-security-policy", "content-security-policy-report-only", "strict-transport-security",
+    "alt-svc", "set-cookie",
+}
+
+
+# -----------------------------------------------------------------------------
+# 녹화
+# -----------------------------------------------------------------------------
+class SnapshotRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.missed = 0
+
+    def capture(self, driver):
+        # 마지막 capture 이후 완료된 GET 응답의 본문을 가져온다 (페이지가 바뀌기 전에 호출해야 본문이 남아 있음)
+        requests, responses = {}, {}
+        for method, params in read_network_events(driver):
+            request_id = params.get("requestId")
+            if method == "Network.requestWillBeSent":
+                requests[request_id] = params["request"]
+            elif method == "Network.responseReceived":
+                responses[request_id] = params["response"]
+            elif method == "Network.loadingFinished" and request_id in responses:
+                request = requests.get(request_id, {})
+                if request.get("method", "GET") != "GET":
+                    continue
+                response = responses[request_id]
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                except Exception:
+                    self.missed += 1
+                    continue
+                self.entries[response["url"]] = {
+                    "request": {"method": "GET", "url": response["url"]},
+                    "response": {
+                        "status": response.get("status", 200),
+                        "headers": [{"name": k, "value": v} for k, v in response.get("headers", {}).items()],
+                        "content": {
+                            "mimeType": response.get("mimeType", ""),
+                            "text": body.get("body", ""),
+                            "encoding": "base64" if body.get("base64Encoded") else "",
+                        },
+                    },
+                }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        har = {"log": {
+            "version": "1.2",
+            "creator": {"name": "daum_search_v8 recorder", "version": "1"},
+            "pages": [{"startedDateTime": datetime.now().isoformat(), "id": "daum_mobile"}],
+            "entries": list(self.entries.values()),
+        }}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(har, f, ensure_ascii=False)
+        log.info(f"🎞️ 스냅샷 저장: {self.path} (응답 {len(self.entries)}개, 본문 누락 {self.missed}개)")
+
+
+# -----------------------------------------------------------------------------
+# 재생
+# -----------------------------------------------------------------------------
+class _Snapshot:
+    def __init__(self, path):
+        with open(path, encoding="utf-8") as f:
+            entries = json.load(f)["log"]["entries"]
+        self.exact = {}
+        self.by_path = {}
+        self.hosts = []
+        for entry in entries:
+            parts = urlsplit(entry["request"]["url"])
+            if parts.hostname not in self.hosts:
+                self.hosts.append(parts.hostname)
+            self.exact[(parts.hostname, parts.path or "/", parts.query)] = entry
+            self.by_path.setdefault((parts.hostname, parts.path or "/"), entry)
+        self.default_host = self.hosts[0] if self.hosts else None
+        self._host_pattern = re.compile(
+            r"(?:https?:)?(?://|\\/\\/)(" + "|".join(re.escape(h) for h in self.hosts) + r")(?=[/\\\"'?#:\s)]|$)"
+        ) if self.hosts else None
+
+    def lookup(self, host, path, query):
+        return self.exact.get((host, path, query)) or self.by_path.get((host, path))
+
+    def rewrite(self, text, base_url):
+        if self._host_pattern is None:
+            return text
+        return self._host_pattern.sub(lambda m: f"{base_url}/{m.group(1)}", text)
+
+
+class ReplayServer:
+    def __init__(self, har_path, latency_ms=0, bandwidth_kbps=None, host="127.0.0.1", port=0):
+        self.snapshot = _Snapshot(har_path)
+        self.latency = latency_ms / 1000
+        self.bytes_per_second = bandwidth_kbps * 1000 / 8 if bandwidth_kbps else None
+        self.stats = {"hits": 0, "misses": 0, "bytes": 0}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def host_resolver_rules(self):
+        # Chrome --host-resolver-rules 값: 모든 호스트 이름 → 이 서버
+        host, port = self._server.server_address[:2]
+        return f"MAP * {host}:{port}"
+
+    def url_for(self, original_url):
+        parts = urlsplit(original_url)
+        query = f"?{parts.query}" if parts.query else ""
+        return f"{self.base_url}/{parts.hostname}{parts.path or '/'}{query}"
+
+    def _resolve(self, handler):
+        parts = urlsplit(handler.path)
+        # host_resolver_rules로 넘어온 요청 → Host 헤더가 원래 호스트 (녹화 안 된 호스트면 lookup에서 404)
+        host = urlsplit(f"//{handler.headers.get('Host', '')}").hostname
+        if host and host not in (self._server.server_address[0], "localhost"):
+            return host, parts.path or "/", parts.query
+        segments = parts.path.lstrip("/").split("/", 1)
+        if segments[0] in self.snapshot.hosts:
+            return segments[0], "/" + (segments[1] if len(segments) > 1 else ""), parts.query
+        # 호스트 접두어 없는 루트 상대 경로 → Referer 호스트 (없으면 첫 녹화 호스트)
+        referer = urlsplit(handler.headers.get("Referer", "")).path.lstrip("/").split("/", 1)[0]
+        host = referer if referer in self.snapshot.hosts else self.snapshot.default_host
+        return host, parts.path or "/", parts.query
+
+    def _handle(self, handler):
+        host, path, query = self._resolve(handler)
+        entry = self.snapshot.lookup(host, path, query)
+        if self.latency:
+            time.sleep(self.latency)
+        if entry is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            handler.send_response(404)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+
+        response = entry["response"]
+        content = response["content"]
+        mime = content.get("mimeType", "")
+        if content.get("encoding") == "base64":
+            body = base64.b64decode(content.get("text", ""))
+        else:
+            text = content.get("text", "")
+            if any(hint in mime for hint in TEXT_MIME_HINTS):
+                text = self.snapshot.rewrite(text, self.base_url)
+            body = text.encode("utf-8")
+
+        status = response.get("status", 200)
+        handler.send_response(status)
+        for header in response.get("headers", []):
+            name = header["name"].lower()
+            if name in DROPPED_HEADERS:
+                continue
+            value = header["value"]
+            if name == "location":
+                value = self.snapshot.rewrite(value, self.base_url)
+            handler.send_header(header["name"], value)
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        self._send_shaped(handler, body)
+        with self._lock:
+            self.stats["hits"] += 1
+            self.stats["bytes"] += len(body)
+
+    def _send_shaped(self, handler, body, chunk_size=16 * 1024):
+        # 대역폭 제한: 청크를 보낼 때마다 그 크기만큼의 전송 시간을 기다린다
+        if not self.bytes_per_second:
+            handler.wfile.write(body)
+            return
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start:start + chunk_size]
+            handler.wfile.write(chunk)
+            handler.wfile.flush()
+            time.sleep(len(chunk) / self.bytes_per_second)
+
+    def start(self):
+        self._thread.start()
+        log.info(f"🎞️ 재생 서버 시작: {self.base_url} (호스트 {len(self.snapshot.hosts)}개, 응답 {len(self.snapshot.exact)}개)")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화된 다음 모바일 페이지를 로컬에서 재생")
+    parser.add_argument("har", nargs="?", default=DEFAULT_FIXTURE, help="녹화 스냅샷(HAR JSON) 경로")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=0, help="응답마다 추가할 지연 (ms)")
+    parser.add_argument("--bandwidth-kbps", type=int, default=None, help="응답 본문 전송 대역폭 제한 (kbps)")
+    args = parser.parse_args()
+    if not os.path.isfile(args.har):
+        parser.error(f"재생할 스냅샷이 없습니다: {args.har} (먼저 daum_search_v8.py --record로 녹화하세요)")
+
+    server = ReplayServer(args.har, args.latency_ms, args.bandwidth_kbps, port=args.port).start()
+    print(f"🏠 홈: {server.url_for('https://m.daum.net/')}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,157 @@
+from dataclasses import dataclass, asdict, fields
+from typing import Optional, Tuple
+import json
+import os
+import threading
+
+from harness_log import get_logger
+from process_local import ProcessLocal
+
+# -----------------------------------------------------------------------------
+# 테스트 결과 레코드 + JSONL 스트리밍 저장
+# -----------------------------------------------------------------------------
+# 결과 한 건 = __slots__ 레코드 (행마다 한글 키 13개를 반복하던 dict 대신)
+# 기록 즉시 JSONL 한 줄로 append → 실행이 중간에 죽어도 그때까지의 결과는 파일에 남는다.
+# 실행 중에는 레코드를 메모리에 쌓지 않는다. 끝난 뒤의 리포트/시트 저장은 이 파일을 다시 읽어서 만든다
+# (정렬이 필요하면 read_jsonl_sorted: 정렬 키와 줄 위치만 모은 뒤 그 순서로 다시 읽음).
+
+log = get_logger("results")
+
+
+@dataclass(slots=True)
+class TestResult:
+    number: str
+    category: str
+    depths: Tuple[str, ...]
+    pre_condition: str
+    expected: str
+    result: str
+    executed_at: str
+    wait_seconds: Optional[float] = None
+    act_seconds: Optional[float] = None
+    error: Optional[str] = None
+    screenshot: Optional[str] = None
+    metrics: Optional[dict] = None  # 부가 측정값 ("net.requests" 등 접두어로 구분)
+
+    @property
+    def quarantined(self):
+        # 격리 레인에서 실행된 결과 (PASS/FAIL 집계·알림에서 제외)
+        return bool(self.metrics and self.metrics.get("quarantine"))
+
+    @property
+    def device(self):
+        # 기기 매트릭스 실행 시 기기 프로필 이름 (일반 실행은 None)
+        return (self.metrics or {}).get("device")
+
+    @property
+    def flaky(self):
+        # 재시도 끝에 통과한 결과
+        return bool(self.metrics and self.metrics.get("retry.flaky"))
+
+    def to_json(self):
+        return json.dumps(asdict(self), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line):
+        data = json.loads(line)
+        known = {f.name for f in fields(cls)}
+        data = {k: v for k, v in data.items() if k in known}
+        data["depths"] = tuple(data.get("depths", ()))
+        return cls(**data)
+
+
+class JsonlResultWriter:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 줄 단위 버퍼링: 한 줄 쓰면 바로 파일로 내려간다 (append 모드라 프로세스 간에도 줄이 섞이지 않음)
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+        self._lock = threading.Lock()
+
+    def write(self, result):
+        line = result.to_json() + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def jsonl_offset(path):
+    # 지금까지 쓰인 크기 - 이어 쓰는 파일에서 이번 실행분만 읽을 때의 시작 위치
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _parse(line):
+    # 마지막 줄이 잘려 있으면(실행 중 강제 종료) 그 줄만 건너뛴다
+    try:
+        return TestResult.from_json(line)
+    except (ValueError, TypeError):
+        log.warning(f"⚠️ 손상된 결과 줄 건너뜀: {line[:80]}")
+        return None
+
+
+def _lines(path, offset=0):
+    # (줄 시작 위치, 내용) - 바이너리로 읽어야 위치를 그대로 seek에 쓸 수 있다
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            position = f.tell()
+            line = f.readline()
+            if not line:
+                return
+            line = line.decode("utf-8", errors="replace").strip()
+            if line:
+                yield position, line
+
+
+def read_jsonl(path, offset=0):
+    if not os.path.exists(path):
+        return
+    for _, line in _lines(path, offset):
+        record = _parse(line)
+        if record is not None:
+            yield record
+
+
+def read_jsonl_sorted(path, key, offset=0):
+    # key(record) 순서로 하나씩 (메모리에는 정렬 키 + 줄 위치만)
+    if not os.path.exists(path):
+        return
+    index = []
+    for position, line in _lines(path, offset):
+        record = _parse(line)
+        if record is not None:
+            index.append((key(record), position))
+    index.sort(key=lambda item: item[0])
+    with open(path, "rb") as f:
+        for _, position in index:
+            f.seek(position)
+            yield TestResult.from_json(f.readline().decode("utf-8"))
+
+
+def durations_from_jsonl(path):
+    # 이전 실행 결과에서 케이스별 소요 시간(대기 + 동작) 추출 - 타이밍 기반 샤딩용
+    durations = {}
+    for record in read_jsonl(path):
+        if record.wait_seconds is not None and record.act_seconds is not None:
+            durations[record.number] = record.wait_seconds + record.act_seconds
+    return durations
+
+
+_shared_writer = ProcessLocal()
+
+
+def shared_result_writer(path):
+    # 프로세스마다 하나의 writer를 열어 공유 (다른 경로를 주면 닫고 새로 연다)
+    return _shared_writer.get(lambda _: JsonlResultWriter(path), JsonlResultWriter.close,
+                              reuse=lambda writer: writer.path == path)
+
+
+def close_shared_result_writer():
+    writer = _shared_writer.detach()
+    if writer is not None:
+        writer.close()
+    return writer
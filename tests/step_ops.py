@@ -0,0 +1,112 @@
+import async_webdriver
+import locators
+from perf_metrics import enable_page_metrics, enable_page_metrics_async
+from waits import ProfiledWait, wait_for_page_ready, wait_for_scroll_settle
+
+# -----------------------------------------------------------------------------
+# 케이스 step을 한 번만 정의 (Selenium 드라이버 / 비동기 세션 공용)
+# -----------------------------------------------------------------------------
+# step은 async def step(ops) 하나로 쓰고, 드라이버 명령은 ops를 거친다.
+#  - SessionOps : AsyncSession 명령을 그대로 await (--async-sessions)
+#  - DriverOps  : 같은 이름의 명령을 Selenium으로 바로 실행 (await 해도 멈추지 않음)
+# DriverStep(flow)는 드라이버용 동기 step(driver), SessionStep(flow)는 비동기 step(session)이 된다
+# (클로저 대신 객체 - 프로세스 풀로 케이스를 넘길 때 pickle 되도록).
+# DriverOps 쪽 코루틴은 중간에 멈출 일이 없으므로 이벤트 루프 없이 끝까지 돌린다 (run_blocking).
+
+
+def run_blocking(coro):
+    # await 하는 곳이 모두 DriverOps(즉시 완료)인 코루틴을 이벤트 루프 없이 실행
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    coro.close()
+    raise RuntimeError("드라이버 step이 실제 비동기 대기(asyncio)를 사용했습니다 - ops 명령만 await 하세요.")
+
+
+class DriverOps:
+    def __init__(self, driver):
+        self.driver = driver
+
+    async def get(self, url):
+        self.driver.get(url)
+
+    async def execute_script(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    async def check(self, batch, timeout):
+        return batch.wait(self.driver, timeout)
+
+    async def clickable(self, name, timeout):
+        return ProfiledWait(self.driver, timeout).until(locators.clickable(name))
+
+    async def click(self, element):
+        element.click()
+
+    async def clear(self, element):
+        element.clear()
+
+    async def send_keys(self, element, text):
+        element.send_keys(text)
+
+    async def wait_for_page_ready(self, timeout):
+        wait_for_page_ready(self.driver, timeout)
+
+    async def wait_for_scroll_settle(self, timeout):
+        wait_for_scroll_settle(self.driver, timeout)
+
+    async def enable_page_metrics(self):
+        enable_page_metrics(self.driver)
+
+
+class SessionOps:
+    def __init__(self, session):
+        self.session = session
+
+    async def get(self, url):
+        await self.session.get(url)
+
+    async def execute_script(self, script, *args):
+        return await self.session.execute_script(script, *args)
+
+    async def check(self, batch, timeout):
+        return await batch.wait_async(self.session, timeout)
+
+    async def clickable(self, name, timeout):
+        return await async_webdriver.wait_until(self.session, async_webdriver.clickable(name), timeout)
+
+    async def click(self, element):
+        await element.click()
+
+    async def clear(self, element):
+        await element.clear()
+
+    async def send_keys(self, element, text):
+        await element.send_keys(text)
+
+    async def wait_for_page_ready(self, timeout):
+        await async_webdriver.wait_for_page_ready(self.session, timeout)
+
+    async def wait_for_scroll_settle(self, timeout):
+        await async_webdriver.wait_for_scroll_settle(self.session, timeout)
+
+    async def enable_page_metrics(self):
+        await enable_page_metrics_async(self.session)
+
+
+class DriverStep:
+    def __init__(self, flow):
+        self.flow = flow
+        self.__name__ = flow.__name__
+
+    def __call__(self, driver, *args):
+        return run_blocking(self.flow(DriverOps(driver), *args))
+
+
+class SessionStep:
+    def __init__(self, flow):
+        self.flow = flow
+        self.__name__ = flow.__name__
+
+    async def __call__(self, session, *args):
+        return await self.flow(SessionOps(session), *args)
@@ -0,0 +1,113 @@
+from selenium.webdriver.common.keys import Keys
+
+import asyncio
+
+import pytest
+
+from async_webdriver import ConnectionPool, FakeWebDriverServer, clickable, open_session, run_cases_async, wait_until
+from waits import current_budget
+
+# -----------------------------------------------------------------------------
+# 비동기 WebDriver 엔진 (가짜 WebDriver 서버 - Chrome 없이)
+# -----------------------------------------------------------------------------
+
+
+async def _search_step(session):
+    element = await wait_until(session, clickable("search_input"), 2)
+    await element.send_keys("pytest" + Keys.ENTER)
+
+
+async def _missing_step(session):
+    await wait_until(session, clickable("search_input"), 0.3)
+
+
+def test_async_engine_against_fake_server(make_case):
+    async def run():
+        server = await FakeWebDriverServer().start()
+        pool = ConnectionPool("127.0.0.1", server.port)
+        rows = []
+        waited = {}
+
+        def log_result(case, result, error, png, metrics):
+            # 기록 시점의 대기 시간은 이 케이스(태스크)의 것 - 동시에 도는 다른 케이스와 섞이지 않는다
+            budget = current_budget()
+            waited[case.case_id] = budget.wait_seconds if budget else None
+            rows.append((case.case_id, result, png))
+
+        async def home(session, case):
+            # 검색 결과 페이지에는 검색창이 없다 → Case 3은 시간 초과로 FAIL
+            await session.get(f"{server.url}/search" if case.case_id == "3" else f"{server.url}/")
+
+        cases = [
+            make_case("1", None, async_step=_search_step),
+            make_case("2", None, async_step=_search_step, depends_on=("1",)),
+            make_case("3", None, async_step=_missing_step),
+            make_case("4", None, async_step=_search_step, depends_on=("3",)),
+        ]
+        try:
+            outcomes = await run_cases_async(
+                cases, lambda: open_session(pool, {"browserName": "chrome"}),
+                log_result,
+                concurrency=2, before_each=home)
+        finally:
+            await pool.close()
+            await server.stop()
+        return outcomes, rows, waited, server
+
+    outcomes, rows, waited, server = asyncio.run(run())
+    assert outcomes == ["PASS", "PASS", "FAIL", "BLOCKED"]
+    # FAIL 결과에는 세션을 닫기 전에 받은 스크린샷이 붙는다
+    assert [png is not None for case_id, result, png in sorted(rows)] == [False, False, True, False]
+    assert server.stats["max_sessions"] <= 2
+    # Case 3은 검색창을 0.3초 기다리다 실패, BLOCKED(Case 4)는 실행하지 않아 집계도 없다
+    assert waited["3"] >= 0.3 and waited["3"] > waited["1"]
+    assert waited["4"] is None
+    assert server.sessions == {}
+
+
+# --- 연결 풀: 응답 전에 끊긴 재사용 연결 ---
+async def _start_dropping_server(received):
+    # 연결마다 첫 요청에만 답하고, 두 번째 요청은 읽기만 한 뒤 응답 없이 끊는다
+    async def serve(reader, writer):
+        try:
+            for answer in (True, False):
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                while (await reader.readline()) not in (b"\r\n", b""):
+                    pass  # 본문 없는 요청만 보낸다
+                received.append(request_line.split()[0].decode())
+                if answer:
+                    data = b'{"value": null}'
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s" % (len(data), data))
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(serve, "127.0.0.1", 0)
+
+
+@pytest.mark.parametrize("method, retried", [("GET", True), ("POST", False)])
+def test_pool_retries_only_idempotent_requests(method, retried):
+    async def run():
+        received = []
+        server = await _start_dropping_server(received)
+        pool = ConnectionPool("127.0.0.1", server.sockets[0].getsockname()[1])
+        try:
+            await pool.request("GET", "/status")
+            try:
+                status = (await pool.request(method, "/session/x/element/y/click"))[0]
+            except (ConnectionError, asyncio.IncompleteReadError):
+                status = None
+        finally:
+            await pool.close()
+            server.close()
+            await server.wait_closed()
+        return received, status
+
+    received, status = asyncio.run(run())
+    if retried:
+        assert (received, status) == (["GET", method, method], 200)
+    else:
+        # 서버가 받았지만 답하지 못한 POST(클릭)는 다시 보내지 않고 실패로 올린다
+        assert (received, status) == (["GET", method], None)
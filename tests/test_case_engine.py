@@ -0,0 +1,69 @@
+from selenium.common.exceptions import TimeoutException
+
+from case_engine import RETRY_POLICIES, CircuitBreaker, RetryPolicy, run_cases
+
+# -----------------------------------------------------------------------------
+# 케이스 엔진 (재시도 정책 / BLOCKED / 서킷 브레이커)
+# -----------------------------------------------------------------------------
+
+
+def test_retry_then_pass(monkeypatch, make_case, recorder):
+    monkeypatch.setitem(RETRY_POLICIES, "timeouts", RetryPolicy("timeouts", attempts=2, retry_on=(TimeoutException,)))
+    calls = []
+
+    def flaky(driver):
+        calls.append(driver)
+        if len(calls) == 1:
+            raise TimeoutException("첫 시도 시간 초과")
+
+    retried = []
+    outcomes = run_cases("driver", [make_case("1", flaky, retry_policy="timeouts")], recorder,
+                         before_retry=lambda driver, case: retried.append(case.case_id))
+
+    assert outcomes == ["PASS"]
+    assert len(calls) == 2 and retried == ["1"]
+    assert recorder.rows == [("1", "PASS", None)]
+
+
+def test_retry_only_on_listed_errors(make_case, recorder):
+    def broken(driver):
+        raise ValueError("스크립트 오류")
+
+    run_cases("driver", [make_case("1", broken, retry_policy="timeouts")], recorder)
+    assert [(case_id, result) for case_id, result, _ in recorder.rows] == [("1", "FAIL")]
+
+
+def test_failed_prerequisite_blocks_dependents(make_case, recorder):
+    def broken(driver):
+        raise AssertionError("홈 화면 없음")
+
+    ran = []
+    cases = [
+        make_case("1", broken),
+        make_case("2", ran.append, depends_on=("1",)),
+        make_case("3", ran.append, depends_on=("2",)),
+        make_case("4", ran.append),
+    ]
+    assert run_cases("driver", cases, recorder) == ["FAIL", "BLOCKED", "BLOCKED", "PASS"]
+    assert ran == ["driver"]
+
+
+def test_setup_failure_is_case_failure(make_case, recorder):
+    ran = []
+
+    def setup(driver, case):
+        raise ConnectionError("홈 이동 실패")
+
+    assert run_cases("driver", [make_case("1", ran.append)], recorder, before_each=setup) == ["FAIL"]
+    assert ran == []
+    assert isinstance(recorder.rows[0][2], ConnectionError)
+
+
+def test_breaker_blocks_after_environment_failures(make_case, recorder):
+    def offline(driver):
+        raise RuntimeError("unknown error: net::ERR_INTERNET_DISCONNECTED")
+
+    breaker = CircuitBreaker(2)
+    cases = [make_case(str(i), offline) for i in range(1, 5)]
+    assert run_cases("driver", cases, recorder, breaker=breaker) == ["FAIL", "FAIL", "BLOCKED", "BLOCKED"]
+    assert breaker.tripped_at == "2"
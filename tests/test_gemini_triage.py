@@ -0,0 +1,49 @@
+import time
+
+from gemini_triage import FailureTriage, HttpModel, StubModelServer
+
+# -----------------------------------------------------------------------------
+# 실패 분석 큐 (스텁 모델 서버 - API 키 없이 돈다)
+# -----------------------------------------------------------------------------
+
+
+def test_triage_calls_model_once_per_failure_kind(tmp_path):
+    server = StubModelServer(latency=0.05).start()
+    cache_path = tmp_path / "triage_cache.json"
+    try:
+        triage = FailureTriage(HttpModel(server.url), concurrency=4, rate=100, cache_path=str(cache_path))
+        # 같은 케이스가 기기별로 실패해도 판정은 따로 남고, 같은 오류(숫자만 다름)는 한 번만 분석
+        triage.submit(("1", "pixel-7"), "TimeoutException: 10.0s 초과")
+        triage.submit(("1", "iphone-14"), "TimeoutException: 12.5s 초과")
+        triage.submit(("2", None), "net::ERR_CONNECTION_REFUSED")
+        verdicts = triage.wait()
+
+        assert set(verdicts) == {("1", "pixel-7"), ("1", "iphone-14"), ("2", None)}
+        assert verdicts[("1", "pixel-7")] == verdicts[("1", "iphone-14")]
+        assert triage.stats["api_calls"] == 2
+        assert triage.stats["cache_hits"] == 1
+        assert server.requests == 2
+
+        # 캐시 파일을 이어 쓰는 다음 실행은 모델을 부르지 않는다
+        again = FailureTriage(HttpModel(server.url), cache_path=str(cache_path))
+        again.submit(("1", None), "TimeoutException: 3s 초과")
+        assert again.wait()[("1", None)] == verdicts[("1", "pixel-7")]
+        assert again.stats["api_calls"] == 0
+        assert server.requests == 2
+    finally:
+        server.stop()
+
+
+def test_triage_respects_rate_limit():
+    server = StubModelServer(latency=0).start()
+    try:
+        triage = FailureTriage(HttpModel(server.url), concurrency=4, rate=10, burst=1)
+        started = time.monotonic()
+        for i in range(4):
+            triage.submit((str(i), None), f"오류 종류 {'abcd'[i]}")
+        triage.wait()
+        # 초당 10회, 몰아서 1회 → 4번째 요청은 최소 0.3초 뒤
+        assert time.monotonic() - started >= 0.3
+        assert server.requests == 4
+    finally:
+        server.stop()
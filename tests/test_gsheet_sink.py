@@ -0,0 +1,31 @@
+from gsheet_sink import BatchedSheetWriter, FakeGspreadClient
+
+# -----------------------------------------------------------------------------
+# 구글 시트 배치 저장 (가짜 gspread 클라이언트)
+# -----------------------------------------------------------------------------
+
+
+def test_sheet_writer_sends_header_with_first_chunk():
+    spreadsheet = FakeGspreadClient().open("WebAuto")
+    writer = BatchedSheetWriter(spreadsheet, "run", ["번호", "결과"], chunk_rows=2)
+    writer.add_rows([[str(i), "PASS"] for i in range(5)])
+    writer.flush()
+
+    worksheet = spreadsheet.worksheets["run"]
+    assert worksheet.values[0] == ["번호", "결과"]
+    assert len(worksheet.values) == 6
+    # 시트 생성 1회 + (헤더 포함 6행 / 청크 2행) 3회
+    assert worksheet.calls == ["append_rows"] * 3
+    assert writer.report() == {"sheet": "run", "rows_written": 5, "api_calls": 4}
+
+
+def test_sheet_writer_appends_later_flushes_without_header():
+    spreadsheet = FakeGspreadClient().open("WebAuto")
+    writer = BatchedSheetWriter(spreadsheet, "run", ["번호"])
+    writer.add_row(["1"])
+    writer.flush()
+    writer.add_row(["2"])
+    writer.flush()
+
+    assert spreadsheet.worksheets["run"].values == [["번호"], ["1"], ["2"]]
+    assert writer.report()["api_calls"] == 3
@@ -0,0 +1,18 @@
+import urllib.request
+
+from network_policy import FixtureSite
+
+# -----------------------------------------------------------------------------
+# 네트워크 차단 정책 집계용 픽스처 사이트
+# -----------------------------------------------------------------------------
+
+
+def test_fixture_site_counts_served_bytes():
+    site = FixtureSite().start()
+    try:
+        with urllib.request.urlopen(site.url + "img/banner.png") as response:
+            body = response.read()
+        assert len(body) == FixtureSite.ASSETS["/img/banner.png"][1]
+        assert site.served == {"requests": 1, "bytes": len(body)}
+    finally:
+        site.stop()
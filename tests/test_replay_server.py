@@ -0,0 +1,78 @@
+import json
+import urllib.error
+import urllib.request
+
+from replay_server import SAMPLE_FIXTURE, ReplayServer, SnapshotRecorder
+
+# -----------------------------------------------------------------------------
+# 녹화 → 재생 (성능 로그를 흉내 내는 가짜 드라이버 + 로컬 재생 서버 - Chrome 없이)
+# -----------------------------------------------------------------------------
+
+
+class _RecordingDriver:
+    # SnapshotRecorder가 쓰는 두 명령만: get_log("performance") / Network.getResponseBody
+    def __init__(self, responses):
+        self.responses = responses  # URL → (mimeType, 본문)
+
+    def get_log(self, kind):
+        entries = []
+        for number, (url, (mime, _)) in enumerate(self.responses.items()):
+            request_id = str(number)
+            for method, params in (
+                ("Network.requestWillBeSent", {"requestId": request_id, "request": {"method": "GET", "url": url}}),
+                ("Network.responseReceived", {"requestId": request_id, "response": {
+                    "url": url, "status": 200, "mimeType": mime, "headers": {"Content-Type": mime}}}),
+                ("Network.loadingFinished", {"requestId": request_id, "encodedDataLength": 100}),
+            ):
+                entries.append({"message": json.dumps({"message": {"method": method, "params": params}})})
+        return entries
+
+    def execute_cdp_cmd(self, cmd, params):
+        url = list(self.responses)[int(params["requestId"])]
+        return {"body": self.responses[url][1], "base64Encoded": False}
+
+
+def _fetch(url, host=None):
+    request = urllib.request.Request(url, headers={"Host": host} if host else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, ""
+
+
+def test_record_then_replay(tmp_path):
+    path = tmp_path / "snapshot.har.json"
+    recorder = SnapshotRecorder(str(path))
+    recorder.capture(_RecordingDriver({
+        "https://m.daum.net/": ("text/html", '<a href="https://m.daum.net/news">뉴스</a>'),
+        "https://m.daum.net/news": ("text/html", "<p>뉴스</p>"),
+    }))
+    recorder.save()
+
+    server = ReplayServer(str(path)).start()
+    try:
+        # 녹화된 호스트의 절대 URL은 재생 서버 주소로 바뀐다
+        status, body = _fetch(server.url_for("https://m.daum.net/"))
+        assert status == 200
+        assert f'href="{server.base_url}/m.daum.net/news"' in body
+        assert _fetch(server.url_for("https://m.daum.net/news"))[1] == "<p>뉴스</p>"
+    finally:
+        server.stop()
+    assert server.stats["hits"] == 2
+
+
+def test_replay_keeps_unrecorded_hosts_offline():
+    server = ReplayServer(SAMPLE_FIXTURE).start()
+    try:
+        assert server.host_resolver_rules == f"MAP * {server.base_url[len('http://'):]}"
+        # host_resolver_rules로 넘어온 요청은 Host 헤더의 원래 호스트로 찾고, 녹화 안 된 호스트는 404
+        assert _fetch(f"{server.base_url}/css/home.css", host="m.daum.net")[0] == 200
+        assert _fetch(f"{server.base_url}/ads.js", host="ads.example.com")[0] == 404
+        # 검색 폼 주소도 재생 서버로 바뀌어, 다른 검색어로 제출해도 녹화된 결과 페이지로 간다
+        status, home = _fetch(server.url_for("https://m.daum.net/"))
+        assert status == 200 and f'action="{server.base_url}/search.daum.net/search"' in home
+        assert _fetch(f"{server.base_url}/search.daum.net/search?w=tot&q=other")[0] == 200
+    finally:
+        server.stop()
+    assert server.stats["misses"] == 1
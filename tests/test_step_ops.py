@@ -0,0 +1,59 @@
+import asyncio
+import pickle
+
+import pytest
+
+from async_webdriver import ConnectionPool, FakeWebDriverServer, open_session
+from step_ops import DriverStep, SessionStep, run_blocking
+
+# -----------------------------------------------------------------------------
+# 공용 step (같은 flow를 Selenium 드라이버 / 비동기 세션에서)
+# -----------------------------------------------------------------------------
+
+
+class _UrlDriver:
+    # DriverOps가 쓰는 명령 중 get / execute_script("location.href")만
+    def __init__(self):
+        self.url = "about:blank"
+
+    def get(self, url):
+        self.url = url
+
+    def execute_script(self, script, *args):
+        return self.url if "location.href" in script else None
+
+
+async def _visit(ops, url):
+    await ops.get(url)
+    return await ops.execute_script("return location.href")
+
+
+def test_same_flow_on_driver_and_session():
+    driver = _UrlDriver()
+    assert DriverStep(_visit)(driver, "https://m.daum.net/") == "https://m.daum.net/"
+
+    async def run():
+        server = await FakeWebDriverServer().start()
+        pool = ConnectionPool("127.0.0.1", server.port)
+        try:
+            async with open_session(pool, {"browserName": "chrome"}) as session:
+                return await SessionStep(_visit)(session, f"{server.url}/"), server.url
+        finally:
+            await pool.close()
+            await server.stop()
+
+    href, base_url = asyncio.run(run())
+    assert href == f"{base_url}/"
+
+
+def test_driver_step_pickles_for_process_pool():
+    step = pickle.loads(pickle.dumps(DriverStep(_visit)))
+    assert step(_UrlDriver(), "https://m.daum.net/") == "https://m.daum.net/"
+
+
+def test_run_blocking_rejects_event_loop_waits():
+    async def sleeps(ops):
+        await asyncio.sleep(0)
+
+    with pytest.raises(RuntimeError):
+        run_blocking(sleeps(None))
@@ -0,0 +1,44 @@
+import asyncio
+
+import tracing
+from async_webdriver import ConnectionPool, FakeWebDriverServer, open_session
+from tracing import close_tracer, read_spans, span
+
+# -----------------------------------------------------------------------------
+# 트레이스 (한 이벤트 루프에서 동시에 도는 케이스끼리 부모 스팬이 섞이지 않는지)
+# -----------------------------------------------------------------------------
+
+
+def test_async_sessions_keep_their_own_parent_span(tmp_path):
+    path = tmp_path / "trace.otlp.jsonl"
+    tracing.configure(str(path))
+
+    async def run():
+        server = await FakeWebDriverServer().start()
+        pool = ConnectionPool("127.0.0.1", server.port)
+
+        async def case(case_id):
+            with span("case", {"case.id": case_id}):
+                async with open_session(pool, {"browserName": "chrome"}) as session:
+                    for _ in range(3):
+                        await session.get(f"{server.url}/")
+                        await asyncio.sleep(0)  # 다른 케이스의 명령이 사이에 끼도록
+
+        try:
+            await asyncio.gather(case("1"), case("2"))
+        finally:
+            await pool.close()
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    finally:
+        close_tracer()
+
+    spans = read_spans(str(path))
+    cases = {s["attributes"]["case.id"]: s["span_id"] for s in spans if s["name"] == "case"}
+    commands = [s for s in spans if s["name"] == "webdriver.POST /url"]
+    assert len(commands) == 6
+    for command in commands:
+        # 명령 스팬은 자기 케이스 스팬 아래에 (case.id도 물려받는다)
+        assert command["parent_id"] == cases[command["attributes"]["case.id"]]
@@ -0,0 +1,112 @@
+from datetime import datetime
+import sqlite3
+import threading
+
+# -----------------------------------------------------------------------------
+# 케이스별 소요 시간 이력 (SQLite, logs/case_timings.sqlite3)
+# -----------------------------------------------------------------------------
+# - 실행이 끝날 때마다 케이스별 소요 시간(대기 + 동작)을 쌓는다.
+# - 최근 N회 기준 p50/p90으로 병렬/샤드 스케줄링(긴 케이스 먼저)에 쓴다.
+# - 이번 소요 시간이 이력 중앙값 대비 기준 배수를 넘으면 성능 저하로 표시한다.
+# - 결과 이력(PASS/FAIL/FLAKY)으로 불안정한 케이스를 골라 격리(quarantine) 레인으로 보낸다.
+
+HISTORY_WINDOW = 50
+MIN_SAMPLES = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS case_runs (
+    case_id   TEXT NOT NULL,
+    duration  REAL NOT NULL,
+    result    TEXT,
+    run_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_case_runs_case ON case_runs (case_id, run_at);
+"""
+
+
+def percentile(values, q):
+    # 선형 보간 백분위수 (values는 정렬된 리스트)
+    if not values:
+        return None
+    position = (len(values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class TimingDB:
+    def __init__(self, path, window=HISTORY_WINDOW):
+        self.path = path
+        self.window = window
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def record_many(self, rows, run_at=None):
+        # rows: (케이스 번호, 소요 초, 결과)
+        run_at = run_at or datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO case_runs (case_id, duration, result, run_at) VALUES (?, ?, ?, ?)",
+                [(case_id, duration, result, run_at) for case_id, duration, result in rows])
+
+    def history(self, case_id):
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT duration FROM case_runs WHERE case_id = ? ORDER BY run_at DESC, rowid DESC LIMIT ?",
+                (case_id, self.window))
+            return sorted(row[0] for row in cursor)
+
+    def stats(self, case_id):
+        values = self.history(case_id)
+        return {
+            "samples": len(values),
+            "p50": percentile(values, 0.5),
+            "p90": percentile(values, 0.9),
+        }
+
+    def expected_durations(self, case_ids, quantile=0.9):
+        # 스케줄링용 예상 소요 시간 (기본 p90: 느린 쪽을 기준으로 잡아 꼬리 지연을 줄인다)
+        durations = {}
+        for case_id in case_ids:
+            value = percentile(self.history(case_id), quantile)
+            if value is not None:
+                durations[case_id] = value
+        return durations
+
+    def find_regressions(self, rows, factor=1.5, min_delta=0.5):
+        # rows: (케이스 번호, 이번 소요 초) - 기록하기 전에 호출해야 이번 값이 이력에 섞이지 않는다
+        regressions = []
+        for case_id, duration in rows:
+            stats = self.stats(case_id)
+            if stats["samples"] < MIN_SAMPLES:
+                continue
+            baseline = stats["p50"]
+            if duration > baseline * factor and duration - baseline > min_delta:
+                regressions.append((case_id, duration, baseline, stats["p90"]))
+        return regressions
+
+    def flaky_cases(self, case_ids, window=20, min_signals=2):
+        # 격리 대상: 최근 window회 중 "재시도 후 통과(FLAKY)" + PASS↔FAIL 전환 횟수가 min_signals 이상
+        # (계속 실패하는 케이스는 불안정한 게 아니라 깨진 것이므로 격리하지 않는다)
+        flaky = []
+        for case_id in case_ids:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "SELECT result FROM case_runs WHERE case_id = ? ORDER BY run_at DESC, rowid DESC LIMIT ?",
+                    (case_id, window))
+                results = [row[0] for row in cursor]
+            flips = sum(1 for a, b in zip(results, results[1:]) if {a, b} == {"PASS", "FAIL"})
+            if results.count("FLAKY") + flips >= min_signals:
+                flaky.append(case_id)
+        return flaky
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def longest_first(cases, durations):
+    # LPT 스케줄: 예상 소요 시간이 긴 케이스부터 (이력 없는 케이스는 가장 앞 - 길이를 모르므로)
+    # 반환값은 실행 순서의 인덱스 목록
+    return sorted(range(len(cases)), key=lambda i: -durations.get(cases[i].case_id, float("inf")))
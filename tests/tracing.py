@@ -0,0 +1,300 @@
+from collections import defaultdict
+from contextlib import contextmanager
+import argparse
+import contextvars
+import json
+import os
+import threading
+import time
+
+from process_local import ProcessLocal
+
+# -----------------------------------------------------------------------------
+# 단계별 트레이스 (OpenTelemetry 형식 스팬 → 로컬 OTLP JSON 파일)
+# -----------------------------------------------------------------------------
+# 드라이버 명령(이동/찾기/클릭/입력/스크립트/스크린샷), 대기, 시트 API 호출을 스팬 하나로 기록한다.
+#  - 스팬 속성: case.id, selector, outcome(ok/error) 등
+#  - 파일 형식: OTLP/JSON 파일 익스포터 형식 (한 줄 = ExportTraceServiceRequest 하나)
+#    → OpenTelemetry Collector filereceiver, Jaeger(OTLP JSON 업로드) 등에서 열 수 있다.
+#  - Perfetto/chrome://tracing 용 변환과 케이스별 요약은 이 파일을 직접 실행:
+#      python tests/tracing.py logs/trace_<시각>.otlp.jsonl --chrome logs/trace.json
+#
+# 트레이스를 켜지 않으면(configure 미호출, 환경 변수 없음) span()은 아무것도 하지 않는다.
+# 현재 스팬(부모)은 contextvars로 - 스레드마다, asyncio 태스크마다 따로 (async_webdriver.py 세션 여러 개를 한 루프에서)
+# 프로세스 풀 워커는 환경 변수로 같은 파일/trace id를 이어받는다 (process_local.py, append 모드 한 줄 쓰기라 섞이지 않음).
+
+TRACE_PATH_ENV = "DAUM_TRACE_PATH"
+TRACE_ID_ENV = "DAUM_TRACE_ID"
+TRACE_ROOT_ENV = "DAUM_TRACE_ROOT"
+SERVICE_NAME = "daum-mobile-web-tests"
+SCOPE_NAME = "daum_search_v8.tracing"
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span = contextvars.ContextVar("daum_trace_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "attributes", "start_ns", "end_ns", "status", "_perf_ns")
+
+    def __init__(self, name, parent_id, attributes):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = STATUS_OK
+        self._perf_ns = time.perf_counter_ns()
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_failure(self, exception, outcome="error"):
+        self.status = STATUS_ERROR
+        self.attributes["outcome"] = outcome
+        self.attributes["exception.type"] = type(exception).__name__
+        self.attributes["exception.message"] = str(exception).split("\n")[0][:200]
+
+    def end(self):
+        # 벽시계 시각은 시작에만 쓰고 길이는 단조 시계로 잰다
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._perf_ns)
+
+
+def _attribute_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Tracer:
+    def __init__(self, path, trace_id=None, root_span_id=None):
+        self.path = path
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.root_span_id = root_span_id or os.urandom(8).hex()
+        self.span_count = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._started_ns = time.time_ns()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    @contextmanager
+    def span(self, name, attributes=None):
+        parent = _current_span.get()
+        attributes = dict(attributes or {})
+        # 케이스 번호는 바깥 스팬에서 물려받는다 (찾기/클릭 스팬에도 case.id가 붙도록)
+        if parent is not None and "case.id" in parent.attributes:
+            attributes.setdefault("case.id", parent.attributes["case.id"])
+        span = Span(name, parent.span_id if parent else self.root_span_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_failure(e)
+            raise
+        else:
+            span.attributes.setdefault("outcome", "ok")
+        finally:
+            _current_span.reset(token)
+            span.end()
+            self.export(span)
+
+    def _otlp_span(self, span):
+        otlp = {
+            "traceId": self.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _attribute_value(v)} for k, v in span.attributes.items()],
+            "status": {"code": span.status},
+        }
+        if span.parent_id:
+            otlp["parentSpanId"] = span.parent_id
+        return otlp
+
+    def export(self, span):
+        line = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}},
+            ]},
+            "scopeSpans": [{"scope": {"name": SCOPE_NAME}, "spans": [self._otlp_span(span)]}],
+        }]}, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork로 넘어온 파일 핸들 대신 자식 프로세스에서 새로 연다
+                self._file = open(self.path, "a", encoding="utf-8", buffering=1)
+                self._pid = os.getpid()
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self.span_count += 1
+
+    def close(self, root_name=None):
+        # 메인 프로세스는 실행 전체를 덮는 루트 스팬을 마지막에 남긴다
+        if root_name:
+            root = Span(root_name, None, {"outcome": "ok"})
+            root.span_id = self.root_span_id
+            root.start_ns = self._started_ns
+            root.end_ns = time.time_ns()
+            self.export(root)
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+_tracer = ProcessLocal({"path": TRACE_PATH_ENV, "trace_id": TRACE_ID_ENV, "root_span_id": TRACE_ROOT_ENV})
+
+
+def configure(path):
+    tracer = Tracer(os.path.abspath(path))
+    _tracer.configure(tracer, path=tracer.path, trace_id=tracer.trace_id, root_span_id=tracer.root_span_id)
+    return tracer
+
+
+def _tracer_from_env(env):
+    # 워커 프로세스는 루트 스팬을 쓰지 않는다 (메인의 close_tracer가 실행 전체 스팬을 남김)
+    return Tracer(env["path"], env["trace_id"], env["root_span_id"]) if env["path"] else None
+
+
+def get_tracer():
+    return _tracer.get(_tracer_from_env, Tracer.close)
+
+
+def close_tracer(root_name="run"):
+    tracer = _tracer.detach()
+    if tracer is not None:
+        tracer.close(root_name)
+    return tracer
+
+
+@contextmanager
+def span(name, attributes=None):
+    tracer = get_tracer()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, attributes) as current:
+        yield current
+
+
+# -----------------------------------------------------------------------------
+# WebDriver 명령 계측 (모든 명령은 driver.execute를 거친다 - WebElement.click/send_keys 포함)
+# asyncio 클라이언트(AsyncSession.command)도 같은 속성으로 기록한다
+# -----------------------------------------------------------------------------
+def command_attributes(command, params):
+    attributes = {"webdriver.command": command}
+    if not params:
+        return attributes
+    if "using" in params:
+        attributes["selector"] = f"{params['using']}={params.get('value')}"
+    if "url" in params:
+        attributes["url"] = params["url"]
+    if "script" in params:
+        attributes["script"] = params["script"].strip()[:120]
+    if "text" in params:
+        # 입력값 자체는 남기지 않는다 (계정 정보 등)
+        attributes["keys.length"] = len(params["text"])
+    if "id" in params:
+        attributes["element.id"] = params["id"]
+    if "cmd" in params:
+        attributes["cdp.cmd"] = params["cmd"]
+    return attributes
+
+
+def instrument_driver(driver):
+    original = driver.execute
+
+    def execute(driver_command, params=None):
+        if get_tracer() is None:
+            return original(driver_command, params)
+        with span(f"webdriver.{driver_command}", command_attributes(driver_command, params)):
+            return original(driver_command, params)
+
+    driver.execute = execute
+    return driver
+
+
+# -----------------------------------------------------------------------------
+# 트레이스 파일 읽기 / 요약 / Chrome trace 변환
+# -----------------------------------------------------------------------------
+def read_spans(path):
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            for resource_spans in request.get("resourceSpans", []):
+                pid = next((a["value"].get("intValue") for a in resource_spans.get("resource", {}).get("attributes", [])
+                            if a["key"] == "process.pid"), "0")
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    for otlp in scope_spans.get("spans", []):
+                        attributes = {a["key"]: next(iter(a["value"].values())) for a in otlp.get("attributes", [])}
+                        start, end = int(otlp["startTimeUnixNano"]), int(otlp["endTimeUnixNano"])
+                        spans.append({
+                            "name": otlp["name"], "span_id": otlp["spanId"], "parent_id": otlp.get("parentSpanId"),
+                            "start_ns": start, "duration": (end - start) / 1e9, "pid": int(pid),
+                            "attributes": attributes,
+                        })
+    return spans
+
+
+def summarize_spans(spans, top=10):
+    # 케이스별로 스팬 이름마다 횟수/합계/최대 (부모-자식 시간이 겹치므로 합계는 이름끼리만 비교)
+    by_case = defaultdict(lambda: defaultdict(list))
+    for s in spans:
+        if s["name"] == "run":
+            continue
+        by_case[s["attributes"].get("case.id", "-")][s["name"]].append(s["duration"])
+    lines = []
+    for case_id in sorted(by_case):
+        rows = sorted(by_case[case_id].items(), key=lambda item: -sum(item[1]))[:top]
+        lines.append(f"[Case #{case_id}]")
+        for name, durations in rows:
+            lines.append(f"  {name:<40} {len(durations):>5}회  합계 {sum(durations):>7.3f}s  최대 {max(durations):>7.3f}s")
+    return "\n".join(lines)
+
+
+def to_chrome_trace(spans):
+    # Trace Event Format ("X" 이벤트) - 케이스마다 한 줄(tid)로 보이게 한다
+    lanes = {}
+    events = []
+    for s in sorted(spans, key=lambda s: s["start_ns"]):
+        lane = lanes.setdefault(s["attributes"].get("case.id", "-"), len(lanes) + 1)
+        events.append({
+            "name": s["name"], "ph": "X", "pid": s["pid"], "tid": lane,
+            "ts": s["start_ns"] / 1000, "dur": s["duration"] * 1e6, "args": s["attributes"],
+        })
+    for case_id, lane in lanes.items():
+        for pid in {s["pid"] for s in spans}:
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": lane,
+                           "args": {"name": f"case {case_id}"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="트레이스 파일(OTLP JSON) 요약 / Chrome trace 변환")
+    parser.add_argument("trace", help="--trace로 저장한 .otlp.jsonl 파일")
+    parser.add_argument("--top", type=int, default=10, help="케이스별로 보여줄 스팬 이름 수")
+    parser.add_argument("--chrome", default=None, help="Perfetto/chrome://tracing 용 JSON 저장 경로")
+    args = parser.parse_args()
+
+    spans = read_spans(args.trace)
+    print(f"🧭 스팬 {len(spans)}개")
+    print(summarize_spans(spans, args.top))
+    if args.chrome:
+        with open(args.chrome, "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(spans), f, ensure_ascii=False)
+        print(f"🧾 Chrome trace 저장: {args.chrome}")
@@ -0,0 +1,196 @@
+from datetime import datetime
+from io import BytesIO
+import hashlib
+import json
+import os
+import time
+
+try:
+    import numpy as np
+    from PIL import Image
+    VISUAL_DIFF_AVAILABLE = True
+except ImportError:
+    VISUAL_DIFF_AVAILABLE = False
+
+# -----------------------------------------------------------------------------
+# 화면 비교 (시각 회귀) - 기준 스크린샷 대비 타일 단위 지각 차이
+# -----------------------------------------------------------------------------
+# 기준 이미지: tests/visual_baselines/<기기>/<케이스>.png + 타일 해시(<케이스>.tiles.json)
+#  1. 현재 스크린샷을 TILE_SIZE 정사각 타일로 나누고 타일마다 해시를 계산한다.
+#  2. 기준 타일 해시와 같은 타일은 건너뛴다 (전부 같으면 기준 PNG는 열지도 않음).
+#  3. 다른 타일만 모아 NumPy로 한꺼번에 밝기 차이를 계산한다.
+#     (2x2 평균으로 안티앨리어싱 수준의 차이를 흐린 뒤, PIXEL_THRESHOLD 이상 달라진 픽셀 비율)
+#  4. 변경 타일을 빨갛게 칠한 히트맵을 logs/에 저장한다.
+# 412x915 캡처 기준 타일 13×29개 → 변경이 없으면 PNG 디코딩 + 해시 수십 ms 안쪽으로 끝난다.
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "visual_baselines")
+TILE_SIZE = 32
+PIXEL_THRESHOLD = 24  # 밝기 차이 (0~255) 이 이상이면 "다른 픽셀"
+TILE_THRESHOLD = 0.01  # 타일 안 다른 픽셀 비율이 이 이상이면 변경 타일
+
+LUMA = (0.299, 0.587, 0.114)
+
+
+class VisualDiffResult:
+    __slots__ = ("status", "changed_tiles", "compared_tiles", "total_tiles", "diff_ratio", "heatmap", "seconds")
+
+    def __init__(self, status, changed_tiles=0, compared_tiles=0, total_tiles=0, diff_ratio=0.0, heatmap=None, seconds=0.0):
+        self.status = status  # match / diff / size-mismatch / no-baseline / updated
+        self.changed_tiles = changed_tiles
+        self.compared_tiles = compared_tiles  # 해시가 달라 실제로 픽셀 비교한 타일 수
+        self.total_tiles = total_tiles
+        self.diff_ratio = diff_ratio  # 변경 타일 / 전체 타일
+        self.heatmap = heatmap
+        self.seconds = seconds
+
+    def to_metrics(self):
+        return {
+            "visual.status": self.status,
+            "visual.changed_tiles": self.changed_tiles,
+            "visual.compared_tiles": self.compared_tiles,
+            "visual.total_tiles": self.total_tiles,
+            "visual.diff_ratio": round(self.diff_ratio, 4),
+            "visual.heatmap": self.heatmap,
+            "visual.ms": round(self.seconds * 1000, 2),
+        }
+
+
+def decode(png_bytes):
+    return np.asarray(Image.open(BytesIO(png_bytes)).convert("RGB"))
+
+
+def tile_grid(array, tile=TILE_SIZE):
+    # (H, W, 3) → (행, 열, tile, tile, 3). 가장자리는 0으로 채워 타일 크기를 맞춘다
+    height, width = array.shape[:2]
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile, 3), dtype=np.uint8)
+    padded[:height, :width] = array
+    return padded.reshape(rows, tile, cols, tile, 3).swapaxes(1, 2)
+
+
+def tile_hashes(grid):
+    rows, cols = grid.shape[:2]
+    flat = np.ascontiguousarray(grid).reshape(rows * cols, -1)
+    return [hashlib.blake2b(tile.tobytes(), digest_size=8).hexdigest() for tile in flat]
+
+
+def _luminance(tiles):
+    return tiles.astype(np.float32) @ np.array(LUMA, dtype=np.float32)
+
+
+def _blur2(tiles):
+    # 2x2 평균 (n, T, T) → (n, T/2, T/2)
+    n, size = tiles.shape[0], tiles.shape[1] // 2 * 2
+    tiles = tiles[:, :size, :size]
+    return tiles.reshape(n, size // 2, 2, size // 2, 2).mean(axis=(2, 4))
+
+
+def tile_differences(current_tiles, baseline_tiles):
+    # (n, T, T, 3) 두 묶음 → 타일별 다른 픽셀 비율 (n,)
+    delta = np.abs(_blur2(_luminance(current_tiles)) - _blur2(_luminance(baseline_tiles)))
+    return (delta >= PIXEL_THRESHOLD).mean(axis=(1, 2))
+
+
+def render_heatmap(array, fractions_grid, tile=TILE_SIZE):
+    # 현재 화면을 어둡게 깔고 변경 타일을 변경 정도만큼 빨갛게
+    height, width = array.shape[:2]
+    alpha = np.clip(fractions_grid / max(TILE_THRESHOLD * 10, 1e-6), 0, 1) * 0.7
+    alpha = np.kron(alpha, np.ones((tile, tile), dtype=np.float32))[:height, :width, None]
+    base = array.astype(np.float32) * 0.5
+    red = np.array([255, 0, 0], dtype=np.float32)
+    blended = base * (1 - alpha) + red * alpha
+    return Image.fromarray(blended.astype(np.uint8))
+
+
+class VisualBaselineStore:
+    def __init__(self, directory=BASELINE_DIR, heatmap_dir="logs", tile=TILE_SIZE, artifact_store=None):
+        if not VISUAL_DIFF_AVAILABLE:
+            raise RuntimeError("화면 비교에는 numpy와 Pillow가 필요합니다.")
+        self.directory = directory
+        self.heatmap_dir = heatmap_dir
+        self.tile = tile
+        self.artifact_store = artifact_store  # 있으면 히트맵을 내용 해시 저장소에 (같은 변경이 반복돼도 한 벌만)
+
+    def _paths(self, case_id, device):
+        folder = os.path.join(self.directory, device)
+        return os.path.join(folder, f"{case_id}.png"), os.path.join(folder, f"{case_id}.tiles.json")
+
+    def update(self, case_id, device, png_bytes):
+        started = time.perf_counter()
+        png_path, tiles_path = self._paths(case_id, device)
+        array = decode(png_bytes)
+        grid = tile_grid(array, self.tile)
+        os.makedirs(os.path.dirname(png_path), exist_ok=True)
+        with open(png_path, "wb") as f:
+            f.write(png_bytes)
+        with open(tiles_path, "w", encoding="utf-8") as f:
+            json.dump({"tile": self.tile, "width": array.shape[1], "height": array.shape[0],
+                       "hashes": tile_hashes(grid)}, f)
+        return VisualDiffResult("updated", total_tiles=grid.shape[0] * grid.shape[1],
+                                seconds=time.perf_counter() - started)
+
+    def _load_hashes(self, tiles_path, png_path):
+        if os.path.exists(tiles_path):
+            with open(tiles_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("tile") == self.tile:
+                return data
+        # 해시 파일이 없거나 타일 크기가 바뀌었으면 기준 이미지에서 다시 계산
+        with open(png_path, "rb") as f:
+            array = decode(f.read())
+        return {"tile": self.tile, "width": array.shape[1], "height": array.shape[0],
+                "hashes": tile_hashes(tile_grid(array, self.tile))}
+
+    def compare(self, case_id, device, png_bytes):
+        started = time.perf_counter()
+        png_path, tiles_path = self._paths(case_id, device)
+        if not os.path.exists(png_path):
+            return VisualDiffResult("no-baseline", seconds=time.perf_counter() - started)
+
+        array = decode(png_bytes)
+        grid = tile_grid(array, self.tile)
+        rows, cols = grid.shape[:2]
+        total = rows * cols
+        baseline = self._load_hashes(tiles_path, png_path)
+        if (baseline["width"], baseline["height"]) != (array.shape[1], array.shape[0]):
+            return VisualDiffResult("size-mismatch", total, 0, total, 1.0, seconds=time.perf_counter() - started)
+
+        current_hashes = tile_hashes(grid)
+        candidates = [i for i, (a, b) in enumerate(zip(current_hashes, baseline["hashes"])) if a != b]
+        if not candidates:
+            return VisualDiffResult("match", 0, 0, total, 0.0, seconds=time.perf_counter() - started)
+
+        # 해시가 다른 타일만 기준 이미지에서 꺼내 한 번에 비교
+        with open(png_path, "rb") as f:
+            baseline_grid = tile_grid(decode(f.read()), self.tile)
+        index = np.array(candidates)
+        r, c = index // cols, index % cols
+        fractions = tile_differences(grid[r, c], baseline_grid[r, c])
+        changed = int((fractions >= TILE_THRESHOLD).sum())
+        if not changed:
+            return VisualDiffResult("match", 0, len(candidates), total, 0.0, seconds=time.perf_counter() - started)
+
+        fractions_grid = np.zeros((rows, cols), dtype=np.float32)
+        fractions_grid[r, c] = np.where(fractions >= TILE_THRESHOLD, fractions, 0)
+        name = f"VISUAL_case_{case_id}_{device}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        image = render_heatmap(array, fractions_grid, self.tile)
+        if self.artifact_store is not None:
+            out = BytesIO()
+            image.save(out, "PNG")
+            heatmap = self.artifact_store.put(out.getvalue(), "png", kind="heatmap", case=case_id, name=name)
+        else:
+            os.makedirs(self.heatmap_dir, exist_ok=True)
+            heatmap = os.path.join(self.heatmap_dir, f"{name}.png")
+            image.save(heatmap)
+        return VisualDiffResult("diff", changed, len(candidates), total, changed / total, heatmap,
+                                seconds=time.perf_counter() - started)
+
+
+def format_visual_report(rows):
+    # rows: (케이스 번호, 기기, metrics)
+    lines = [f"{'케이스':>6} {'기기':>16} {'상태':>13} {'변경/비교/전체 타일':>20} {'비교(ms)':>9}  히트맵"]
+    for case_id, device, m in rows:
+        tiles = f"{m['visual.changed_tiles']}/{m['visual.compared_tiles']}/{m['visual.total_tiles']}"
+        lines.append(f"{case_id:>6} {device:>16} {m['visual.status']:>13} {tiles:>20} {m['visual.ms']:>9.1f}  "
+                     f"{m['visual.heatmap'] or '-'}")
+    return "\n".join(lines)
@@ -0,0 +1,130 @@
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from contextlib import contextmanager
+import contextvars
+import time
+
+from harness_log import get_logger
+from tracing import span
+
+# -----------------------------------------------------------------------------
+# 이벤트 기반 대기 (고정 time.sleep 대체) + 케이스별 대기/동작 시간 측정
+# -----------------------------------------------------------------------------
+
+POLL_INTERVAL = 0.1
+NETWORK_IDLE_MS = 500
+
+log = get_logger("waits")
+
+# 스레드마다 / asyncio 태스크마다 따로 (한 이벤트 루프에서 도는 비동기 케이스끼리 섞이지 않도록)
+_current = contextvars.ContextVar("daum_wait_budget", default=None)
+
+
+class WaitBudget:
+    def __init__(self, case_id):
+        self.case_id = case_id
+        self.wait_seconds = 0.0
+        self.attempts = 1  # 재시도 포함 실행 횟수 (case_engine.run_case가 갱신)
+        self._started = time.perf_counter()
+
+    def add_wait(self, seconds):
+        self.wait_seconds += seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self._started
+
+    def act_seconds(self):
+        return max(0.0, self.elapsed() - self.wait_seconds)
+
+
+@contextmanager
+def case_budget(case_id):
+    # 현재 스레드/태스크에서 실행 중인 케이스의 대기 시간을 모은다
+    budget = WaitBudget(case_id)
+    token = _current.set(budget)
+    try:
+        yield budget
+    finally:
+        _current.reset(token)
+
+
+def current_budget():
+    return _current.get()
+
+
+@contextmanager
+def waiting(condition="wait"):
+    started = time.perf_counter()
+    try:
+        with span("wait", {"wait.condition": condition}):
+            yield
+    finally:
+        budget = current_budget()
+        if budget is not None:
+            budget.add_wait(time.perf_counter() - started)
+
+
+def _condition_name(method):
+    # EC.visibility_of_element_located(...) → "visibility_of_element_located" (람다/함수는 이름 그대로)
+    qualname = getattr(method, "__qualname__", type(method).__name__)
+    return qualname.split(".<locals>")[0]
+
+
+class ProfiledWait(WebDriverWait):
+    # WebDriverWait와 동일하게 쓰되, until에 걸린 시간을 대기 시간으로 집계
+    def __init__(self, driver, timeout, poll_frequency=POLL_INTERVAL, ignored_exceptions=None):
+        super().__init__(driver, timeout, poll_frequency=poll_frequency, ignored_exceptions=ignored_exceptions)
+
+    def until(self, method, message=""):
+        with waiting(_condition_name(method)):
+            return super().until(method, message)
+
+    def until_not(self, method, message=""):
+        with waiting("not " + _condition_name(method)):
+            return super().until_not(method, message)
+
+
+# --- 페이지 로드 완료: readyState == complete 이후 리소스 요청이 idle_ms 동안 늘지 않으면 완료 ---
+def wait_for_page_ready(driver, timeout, idle_ms=NETWORK_IDLE_MS):
+    wait = ProfiledWait(driver, timeout)
+    wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
+
+    state = {"count": -1, "since": time.perf_counter()}
+
+    def network_idle(d):
+        count = d.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.perf_counter()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+            return False
+        return (now - state["since"]) * 1000 >= idle_ms
+
+    try:
+        wait.until(network_idle)
+    except TimeoutException:
+        # 광고/폴링 요청이 끊이지 않는 페이지는 readyState 기준으로 진행
+        log.warning("⚠️ 네트워크 idle 대기 시간 초과 - readyState 기준으로 진행합니다.")
+
+
+# --- 스크롤 완료: scrollY가 두 번 연속 같은 값이면 멈춘 것으로 본다 ---
+def wait_for_scroll_settle(driver, timeout):
+    state = {"last": None}
+
+    def settled(d):
+        position = d.execute_script("return window.scrollY")
+        stable = position == state["last"]
+        state["last"] = position
+        return stable
+
+    ProfiledWait(driver, timeout).until(settled)
+
+
+def format_wait_report(rows):
+    # rows: (케이스 번호, 대기 초, 동작 초)
+    lines = [f"{'케이스':>6} {'대기(s)':>8} {'동작(s)':>8} {'대기 비율':>8}"]
+    for case_id, wait_s, act_s in rows:
+        total = wait_s + act_s
+        ratio = (wait_s / total * 100) if total else 0.0
+        lines.append(f"{case_id:>6} {wait_s:>8.3f} {act_s:>8.3f} {ratio:>7.1f}%")
+    return "\n".join(lines)